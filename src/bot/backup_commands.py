@@ -224,7 +224,7 @@ async def backup_restore(update: Update, context: ContextTypes.DEFAULT_TYPE, val
         await update.message.reply_text("🔄 Starting database restore...")
         
         if BackupFactory.is_postgresql():
-            if backup_path.endswith('.sql'):
+            if backup_path.endswith(('.sql', '.sql.zst')):
                 success = await backup_service.restore_from_sql(backup_path, confirm=True)
             else:
                 await update.message.reply_text("❌ JSON restore not implemented for PostgreSQL yet")
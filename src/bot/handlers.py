@@ -742,19 +742,9 @@ async def export_command(update: Update, context: ContextTypes.DEFAULT_TYPE, val
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"gym_tracker_export_{user_name}_{timestamp}.{format_type}"
 
-        # Prepare file content
-        if format_type == "json":
-            import json
-            # result.data is already a JSON string, so we need to parse it first
-            file_content = result.data.encode("utf-8")
-            mime_type = "application/json"
-        else:  # csv
-            file_content = result.data.encode("utf-8")
-            mime_type = "text/csv"
-
-        # Send file
+        # Send file (result.data is already UTF-8 encoded)
         from io import BytesIO
-        file_obj = BytesIO(file_content)
+        file_obj = BytesIO(result.data)
         file_obj.name = filename
 
         await update.message.reply_document(
@@ -762,7 +752,7 @@ async def export_command(update: Update, context: ContextTypes.DEFAULT_TYPE, val
             filename=filename,
             caption=f"✅ **Exportação concluída!**\n\n"
                    f"📁 **Arquivo:** `{filename}`\n"
-                   f"📊 **{summary['total_sessions']} sessões exportadas**\n"
+                   f"📊 **{result.summary.total_sessions} sessões exportadas**\n"
                    f"📄 **Formato:** {format_type.upper()}",
             parse_mode="Markdown",
         )
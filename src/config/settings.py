@@ -24,6 +24,11 @@ class Settings(BaseSettings):
     # Test database override
     TEST_DATABASE_URL: Optional[str] = Field(None, description="Test database URL (overrides DATABASE_URL in test environment)")
 
+    # Connection pool (server databases only; SQLite uses no pool)
+    DATABASE_POOL_SIZE: int = Field(default=10, gt=0, le=100, description="Persistent connections kept in the pool")
+    DATABASE_MAX_OVERFLOW: int = Field(default=20, ge=0, le=100, description="Extra connections allowed beyond the pool size")
+    DATABASE_POOL_RECYCLE_SECONDS: int = Field(default=1800, gt=0, le=86400, description="Recycle pooled connections after this many seconds")
+
     # AI/ML settings
     WHISPER_MODEL: str = Field(default="whisper-large-v3", description="Whisper model to use for transcription")
     LLM_MODEL: str = Field(default="llama3.1:8b", description="LLM model for text processing")
@@ -56,6 +61,23 @@ class Settings(BaseSettings):
     # LLM settings
     LLM_TEMPERATURE: float = Field(default=0.1, ge=0.0, le=2.0, description="LLM temperature")
     LLM_MAX_TOKENS: int = Field(default=8000, gt=0, le=100000, description="LLM max tokens")
+    LLM_CACHE_MAX_ENTRIES: int = Field(default=1000, ge=0, le=100000, description="Parsed transcriptions kept in the LLM response cache (0 disables it)")
+    LLM_CACHE_TTL_SECONDS: int = Field(default=86400, gt=0, le=604800, description="LLM response cache lifetime in seconds")
+    LLM_MAX_RETRIES: int = Field(default=3, ge=0, le=10, description="Retries with exponential backoff for rate-limited or transient LLM API errors")
+    LLM_MAX_CONCURRENCY: int = Field(default=4, gt=0, le=100, description="Max concurrent LLM API requests")
+    LLM_REQUESTS_PER_MINUTE: int = Field(default=30, gt=0, le=10000, description="Max LLM API requests per minute")
+
+    # User authorization cache
+    USER_AUTH_CACHE_MAX_ENTRIES: int = Field(default=1024, ge=0, le=100000, description="Users whose authorization flags are cached (0 disables it)")
+    USER_AUTH_CACHE_TTL_SECONDS: int = Field(default=60, gt=0, le=3600, description="Authorization cache lifetime in seconds")
+
+    # Backup settings
+    BACKUP_SQL_COMPRESSION: bool = Field(default=False, description="Write SQL backups as zstd-compressed .sql.zst (opt-in: needs pg_dump 16+ and zstd, which the image does not provide)")
+    BACKUP_SQL_ZSTD_LEVEL: int = Field(default=3, ge=1, le=19, description="zstd compression level for SQL backups")
+
+    # Health check settings
+    HEALTH_CACHE_TTL_SECONDS: float = Field(default=5.0, ge=0, le=300, description="Cache lifetime for the full health report")
+    HEALTH_SIMPLE_CACHE_TTL_SECONDS: float = Field(default=2.0, ge=0, le=300, description="Cache lifetime for the quick health check")
 
     # Logging limits
     LOG_TEXT_PREVIEW_LENGTH: int = Field(default=100, gt=0, le=1000, description="Log text preview length")
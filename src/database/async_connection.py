@@ -5,6 +5,7 @@ from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from typing import Optional
 
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import NullPool
 
@@ -15,12 +16,24 @@ from database.models import Base
 logger = get_logger(__name__)
 
 
+def _create_missing_indexes(connection: Connection) -> None:
+    """Create model indexes added after their table already existed
+    
+    create_all skips existing tables entirely, including their indexes.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
 class AsyncDatabaseConnection:
     """Async database connection manager with connection pooling"""
 
     _instance: Optional["AsyncDatabaseConnection"] = None
     _engine: Optional[AsyncEngine] = None
     _session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+    _health_engine: Optional[AsyncEngine] = None
+    _health_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
     _lock: asyncio.Lock = asyncio.Lock()
 
     def __new__(cls) -> "AsyncDatabaseConnection":
@@ -32,21 +45,7 @@ class AsyncDatabaseConnection:
         """Initialize async database connection"""
         async with self._lock:
             if self._engine is None:
-                # Use effective database URL (supports test environment override)
-                database_url = settings.effective_database_url
-
-                # Convert database URL to async version if needed
-                if database_url.startswith("sqlite:///"):
-                    async_url = database_url.replace("sqlite:///", "sqlite+aiosqlite:///")
-                elif database_url.startswith("postgresql://"):
-                    # Railway provides postgresql:// but we need postgresql+asyncpg://
-                    async_url = database_url.replace("postgresql://", "postgresql+asyncpg://")
-                elif database_url.startswith("postgres://"):
-                    # Some services use postgres:// instead of postgresql://
-                    async_url = database_url.replace("postgres://", "postgresql+asyncpg://")
-                else:
-                    # Already in async format or other database
-                    async_url = database_url
+                async_url = self._async_database_url()
 
                 # Configure engine based on database type
                 if "sqlite" in async_url:
@@ -62,9 +61,10 @@ class AsyncDatabaseConnection:
                         async_url,
                         echo=False,  # True for debug SQL
                         pool_pre_ping=True,
-                        pool_size=10,           # Connection pool size
-                        max_overflow=20,        # Additional connections beyond pool_size
-                        pool_recycle=3600,      # Recycle connections after 1 hour
+                        pool_size=settings.DATABASE_POOL_SIZE,
+                        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+                        # Recycle before managed Postgres idle timeouts drop connections
+                        pool_recycle=settings.DATABASE_POOL_RECYCLE_SECONDS,
                         pool_timeout=30,        # Timeout for getting connection from pool
                     )
 
@@ -77,9 +77,63 @@ class AsyncDatabaseConnection:
                 # Create tables if they don't exist
                 async with self._engine.begin() as conn:
                     await conn.run_sync(Base.metadata.create_all)
+                    await conn.run_sync(_create_missing_indexes)
 
                 logger.info(f"Async database initialized: {async_url}")
 
+    @staticmethod
+    def _async_database_url() -> str:
+        """Get the effective database URL with an async driver"""
+        # Use effective database URL (supports test environment override)
+        database_url = settings.effective_database_url
+
+        # Convert database URL to async version if needed
+        if database_url.startswith("sqlite:///"):
+            return database_url.replace("sqlite:///", "sqlite+aiosqlite:///")
+        if database_url.startswith("postgresql://"):
+            # Railway provides postgresql:// but we need postgresql+asyncpg://
+            return database_url.replace("postgresql://", "postgresql+asyncpg://")
+        if database_url.startswith("postgres://"):
+            # Some services use postgres:// instead of postgresql://
+            return database_url.replace("postgres://", "postgresql+asyncpg://")
+        # Already in async format or other database
+        return database_url
+
+    async def initialize_health(self) -> None:
+        """Initialize the small engine reserved for health probes
+
+        Health checks get their own connections so a saturated application
+        pool can't make probes fail, and probes can't starve user commands.
+        """
+        async with self._lock:
+            if self._health_engine is None:
+                async_url = self._async_database_url()
+
+                if "sqlite" in async_url:
+                    self._health_engine = create_async_engine(
+                        async_url,
+                        echo=False,
+                        poolclass=NullPool,
+                    )
+                else:
+                    self._health_engine = create_async_engine(
+                        async_url,
+                        echo=False,
+                        pool_pre_ping=False,    # The probe itself is the ping
+                        # A full report holds at most two connections at once
+                        # (DB check + metrics query), plus one quick /health
+                        pool_size=3,
+                        max_overflow=0,
+                        pool_recycle=300,
+                        pool_timeout=5,
+                    )
+
+                self._health_session_factory = async_sessionmaker(
+                    bind=self._health_engine,
+                    class_=AsyncSession,
+                    expire_on_commit=False,
+                )
+
     async def get_session(self) -> AsyncSession:
         """Get an async database session"""
         if self._session_factory is None:
@@ -95,6 +149,17 @@ class AsyncDatabaseConnection:
         finally:
             await session.close()
 
+    @asynccontextmanager
+    async def get_health_session_context(self) -> AsyncGenerator[AsyncSession, None]:
+        """Get a session from the health-check engine as a context manager"""
+        if self._health_session_factory is None:
+            await self.initialize_health()
+        session = self._health_session_factory()
+        try:
+            yield session
+        finally:
+            await session.close()
+
     @property
     def engine(self) -> Optional[AsyncEngine]:
         """Get the async engine"""
@@ -102,6 +167,10 @@ class AsyncDatabaseConnection:
 
     async def close(self) -> None:
         """Close the async database connection"""
+        if self._health_engine:
+            await self._health_engine.dispose()
+            self._health_engine = None
+            self._health_session_factory = None
         if self._engine:
             await self._engine.dispose()
             logger.info("Async database connection closed")
@@ -123,3 +192,10 @@ async def get_async_session_context() -> AsyncGenerator[AsyncSession, None]:
     async with async_db.get_session_context() as session:
         yield session
 
+
+
+@asynccontextmanager
+async def get_health_session_context() -> AsyncGenerator[AsyncSession, None]:
+    """Get a health-check session as a context manager"""
+    async with async_db.get_health_session_context() as session:
+        yield session
@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime
 
-from sqlalchemy import JSON, Boolean, Column, Date, DateTime, Enum, Float, ForeignKey, Integer, String, Text, Time
+from sqlalchemy import JSON, Boolean, Column, Date, DateTime, Enum, Float, ForeignKey, Index, Integer, String, Text, Time
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -34,6 +34,11 @@ class User(Base):
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     created_by = Column(String(50))  # User ID of who created this user
     
+    __table_args__ = (
+        # Covers the authorization lookup (is_active, is_admin) without reading the row
+        Index("ix_users_auth", "user_id", "is_active", "is_admin"),
+    )
+    
     def __repr__(self):
         return f"<User(user_id='{self.user_id}', username='{self.username}', is_admin={self.is_admin})>"
 
@@ -55,7 +60,7 @@ class WorkoutSession(Base):
     duration_minutes = Column(Integer)
 
     # ===== DADOS DA IA =====
-    original_transcription = Column(Text)      # AGORA: Acumula todas as transcrições
+    original_transcription = Column(Text)      # Última transcrição (histórico em SessionAudio)
     llm_model_used = Column(String(50))
     processing_time_seconds = Column(Float)
 
@@ -67,6 +72,13 @@ class WorkoutSession(Base):
     # Relacionamentos
     exercises = relationship("WorkoutExercise", back_populates="session", cascade="all, delete-orphan")
     aerobics = relationship("AerobicExercise", back_populates="session", cascade="all, delete-orphan")
+    # Histórico completo: carregar explicitamente (selectinload) quando necessário.
+    # Nunca é carregado implicitamente, então a remoção fica a cargo do
+    # ondelete="CASCADE" da FK (o SQLite só o aplica com PRAGMA foreign_keys=ON)
+    audios = relationship(
+        "SessionAudio", back_populates="session", cascade="all, delete-orphan",
+        order_by="SessionAudio.audio_number", lazy="noload", passive_deletes=True,
+    )
 
 class Exercise(Base):
     """Catálogo de exercícios"""
@@ -118,3 +130,21 @@ class AerobicExercise(Base):
     # Relacionamentos
     session = relationship("WorkoutSession", back_populates="aerobics")
     exercise = relationship("Exercise")
+
+class SessionAudio(Base):
+    """Transcrições de cada áudio/texto enviado na sessão"""
+
+    __tablename__ = "session_audios"
+
+    audio_id = Column(Integer, primary_key=True, autoincrement=True)
+    session_id = Column(Integer, ForeignKey("workout_sessions.session_id", ondelete="CASCADE"), nullable=False)
+    audio_number = Column(Integer, nullable=False)  # Valor de audio_count quando o áudio foi salvo
+    transcription = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.now)
+
+    __table_args__ = (
+        Index("ix_session_audios_session", "session_id", "audio_number"),
+    )
+
+    # Relacionamentos
+    session = relationship("WorkoutSession", back_populates="audios")
@@ -10,7 +10,7 @@ This module provides type-safe models for various services including:
 from datetime import date, datetime
 from typing import Any, Literal, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 
 # =============================================================================
@@ -178,19 +178,16 @@ class ExportSummary(BaseModel):
                 )
         return v
 
-    @field_validator('total_exercises')
-    @classmethod
-    def validate_total_exercises(cls, v: int, info) -> int:
+    @model_validator(mode='after')
+    def validate_total_exercises(self) -> "ExportSummary":
         """Ensure total exercises = resistance + aerobic"""
-        if info.data:
-            resistance = info.data.get('resistance_exercises', 0)
-            aerobic = info.data.get('aerobic_exercises', 0)
-            expected_total = resistance + aerobic
-            if v != expected_total:
-                raise ValueError(
-                    f"Total exercises ({v}) must equal resistance ({resistance}) + aerobic ({aerobic})"
-                )
-        return v
+        expected_total = self.resistance_exercises + self.aerobic_exercises
+        if self.total_exercises != expected_total:
+            raise ValueError(
+                f"Total exercises ({self.total_exercises}) must equal resistance "
+                f"({self.resistance_exercises}) + aerobic ({self.aerobic_exercises})"
+            )
+        return self
 
     model_config = {"frozen": True}
 
@@ -199,12 +196,16 @@ class ExportResult(BaseModel):
     """Result of a data export operation"""
 
     success: bool = Field(description="Whether export was successful")
-    format: Literal["json", "csv"] = Field(description="Export format")
-    data: str = Field(description="Exported data as string")
+    format: Literal["json", "csv", "raw"] = Field(description="Export format")
+    data: bytes = Field(description="Exported data as UTF-8 encoded bytes")
+    records: Optional[list[dict[str, Any]]] = Field(
+        default=None, description="Unserialized session dicts for 'raw' exports",
+    )
     summary: ExportSummary = Field(description="Summary statistics")
     export_date: str = Field(description="ISO format export timestamp")
     user_id: str = Field(description="User ID for the export")
     message: Optional[str] = Field(default=None, description="Error or info message")
+    file_path: Optional[str] = Field(default=None, description="File the export was streamed to, if any")
 
     @field_validator('export_date')
     @classmethod
@@ -497,24 +497,36 @@ class BackupService:
             logger.exception("Scheduled backup failed")
 
     async def _run_async_scheduler(self):
-        """Run the async backup scheduler"""
-        next_backup_time = datetime.now() + timedelta(hours=self.backup_frequency_hours)
-        logger.info(f"Next backup scheduled for: {next_backup_time}")
+        """Run the async backup scheduler
 
-        while self.is_running:
+        Sleeps on the stop event until the next backup is due, so a stop
+        request wakes it immediately instead of at the next poll.
+        """
+        if self._stop_event is None:
+            self._stop_event = asyncio.Event()
+        self._stop_event.clear()
+
+        # Monotonic clock, so wall-clock adjustments don't shift the schedule
+        loop = asyncio.get_running_loop()
+        interval = self.backup_frequency_hours * 3600
+        next_backup_at = loop.time() + interval
+        logger.info(f"Next backup scheduled for: {datetime.now() + timedelta(seconds=interval)}")
+
+        while self.is_running and not self._stop_event.is_set():
             try:
-                current_time = datetime.now()
-
-                if current_time >= next_backup_time:
-                    await self._scheduled_backup()
-                    next_backup_time = current_time + timedelta(hours=self.backup_frequency_hours)
-                    logger.info(f"Next backup scheduled for: {next_backup_time}")
-
-                # Check every 5 seconds for faster shutdown response
-                for _ in range(12):  # 12 * 5 = 60 seconds total
-                    if not self.is_running:
-                        return  # Exit immediately if stopped
-                    await asyncio.sleep(5)
+                delay = max(0.0, next_backup_at - loop.time())
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), timeout=delay)
+                    return  # Stop requested
+                except asyncio.TimeoutError:
+                    pass
+
+                if not self.is_running or self._stop_event.is_set():
+                    return
+
+                next_backup_at = loop.time() + interval
+                await self._scheduled_backup()
+                logger.info(f"Next backup scheduled for: {datetime.now() + timedelta(seconds=next_backup_at - loop.time())}")
 
             except asyncio.CancelledError:
                 logger.info("Backup scheduler cancelled")
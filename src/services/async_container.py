@@ -116,6 +116,11 @@ class AsyncServiceContainer:
     async def shutdown(self) -> None:
         """Shutdown async services and cleanup resources"""
         async with self._lock:
+            # Close the LLM HTTP client (keep-alive connection pool)
+            llm_service = self._services.get(LLMParsingService)
+            if llm_service is not None:
+                await llm_service.close()
+
             # Close database connections
             await async_db.close()
 
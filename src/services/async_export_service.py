@@ -1,22 +1,81 @@
 """Async export service for workout data in multiple formats"""
 
-import csv
+import asyncio
 import json
 import logging
 from datetime import date, datetime
-from io import StringIO
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from io import BytesIO, TextIOWrapper
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+from sqlalchemy import ColumnElement, Float, Integer, Row, Select, String, cast, func, literal, null, select, union_all
+from sqlalchemy.orm import joinedload, load_only, raiseload, selectinload
 
 from database.async_connection import get_async_session_context
-from database.models import AerobicExercise, SessionStatus, WorkoutExercise, WorkoutSession
+from database.models import AerobicExercise, Exercise, SessionStatus, WorkoutExercise, WorkoutSession
 from models.service_models import DateRange, ExportPreview, ExportResult, ExportSummary
 from services.exceptions import DatabaseError, ValidationError
 
 logger = logging.getLogger(__name__)
 
+# Write buffer used when streaming an export straight to a file
+_EXPORT_BUFFER_SIZE = 1 << 20
+
+# Rows fetched per round trip while streaming exports
+_JSON_SESSION_BATCH = 200
+_CSV_ROW_BATCH = 1000
+
+_CSV_HEADER: Tuple[str, ...] = (
+    "session_id", "date", "status", "duration_minutes",
+    "exercise_type", "exercise_name", "muscle_group", "equipment",
+    "sets", "reps", "weight", "rest_seconds",
+    "duration_minutes_cardio", "distance_km", "calories", "intensity",
+    "notes",
+)
+
+# Blank padding (one comma per empty field) for the columns a row kind does not use
+_NO_EXERCISE_FIELDS = "," * 12      # exercise_type .. intensity
+_NO_RESISTANCE_FIELDS = "," * 6     # muscle_group .. rest_seconds
+_NO_CARDIO_FIELDS = "," * 4         # duration_minutes_cardio .. intensity
+
+
+# Exported text for each session status
+_STATUS_STR = {status: status.value for status in SessionStatus}
+
+# Characters that force a CSV field to be quoted (csv.QUOTE_MINIMAL)
+_CSV_SPECIAL_CHARS = frozenset(',"\r\n')
+
+
+@lru_cache(maxsize=1024)
+def _csv_list_field(values: tuple) -> str:
+    """CSV field holding a JSON-encoded reps/weights list
+
+    Set patterns repeat a lot across rows, so the encoded field is memoized.
+    """
+    return _csv_field(json.dumps(list(values)))
+
+
+def _csv_field(value: Any) -> str:
+    """Format one CSV field exactly like csv.writer's default excel dialect"""
+    if value is None:
+        return ""
+    if type(value) is not str:
+        # Numbers never need quoting
+        return str(value)
+    if _CSV_SPECIAL_CHARS.isdisjoint(value):
+        return value
+    return '"' + value.replace('"', '""') + '"'
+
+
+def _csv_number(value: Any) -> str:
+    """Format a numeric CSV field; numbers never need quoting"""
+    return "" if value is None else str(value)
+
+
+def _csv_line(row: Iterable[Any]) -> str:
+    """Encode a row as a CSV line terminated by CRLF, as csv.writer does"""
+    return ",".join(map(_csv_field, row)) + "\r\n"
+
 
 class AsyncExportService:
     """Async service for exporting workout data in various formats"""
@@ -28,15 +87,21 @@ class AsyncExportService:
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
         include_active: bool = True,
+        output_path: Optional[str] = None,
     ) -> ExportResult:
         """Export all workout data for a user (async)
 
         Args:
             user_id: User ID to export data for
-            format: Export format ('json' or 'csv')
+            format: Export format ('json', 'csv', or 'raw' for the session
+                dicts in ``ExportResult.records`` without serializing them)
             start_date: Optional start date filter
             end_date: Optional end date filter
             include_active: Whether to include active (non-finished) sessions
+            output_path: Optional file path to write the export to. When given,
+                the data is streamed to disk and ``ExportResult.data`` is empty;
+                otherwise ``data`` holds the UTF-8 encoded export.
+                Not supported for the 'raw' format
 
         Returns:
             ExportResult with exported data and metadata
@@ -49,53 +114,60 @@ class AsyncExportService:
         if not user_id or not user_id.strip():
             raise ValidationError("User ID is required")
 
-        if format not in ["json", "csv"]:
-            raise ValidationError("Format must be 'json' or 'csv'")
+        if format not in ["json", "csv", "raw"]:
+            raise ValidationError("Format must be 'json', 'csv' or 'raw'")
+
+        if format == "raw" and output_path:
+            raise ValidationError("Raw exports cannot be written to a file")
+
+        # One timestamp for the whole export, shared by payload and result
+        exported_at = datetime.now().isoformat()
+        filters = self._session_filters(user_id, start_date, end_date, include_active)
 
         async with get_async_session_context() as session:
             try:
-                # Get user's workout sessions
-                sessions = await self._get_user_sessions(
-                    session, user_id, start_date, end_date, include_active,
-                )
+                # Summary comes from aggregate queries; the data itself is streamed
+                summary = await self._query_export_summary(session, filters)
 
-                if not sessions:
+                if summary.total_sessions == 0:
                     # Return empty result with message
                     return ExportResult(
                         success=False,
                         format=format,
-                        data="",
-                        summary=ExportSummary(
-                            total_sessions=0,
-                            completed_sessions=0,
-                            active_sessions=0,
-                            total_exercises=0,
-                            resistance_exercises=0,
-                            aerobic_exercises=0,
-                            total_duration_minutes=0,
-                            date_range=None,
-                        ),
-                        export_date=datetime.now().isoformat(),
+                        data=b"",
+                        summary=summary,
+                        export_date=exported_at,
                         user_id=user_id,
                         message="No workout data found for export",
                     )
 
                 # Export data based on format
-                if format == "json":
-                    export_data = await self._export_to_json(sessions)
-                else:  # csv
-                    export_data = await self._export_to_csv(sessions)
+                if format == "raw":
+                    return ExportResult(
+                        success=True,
+                        format=format,
+                        data=b"",
+                        records=await self._export_raw(session, filters),
+                        summary=summary,
+                        export_date=exported_at,
+                        user_id=user_id,
+                    )
 
-                # Calculate summary statistics
-                summary = await self._calculate_export_summary(sessions)
+                if output_path:
+                    with open(output_path, "w", buffering=_EXPORT_BUFFER_SIZE, newline="", encoding="utf-8") as f:
+                        await self._export(session, format, filters, exported_at, summary, f)
+                    export_data = b""
+                else:
+                    export_data = await self._export(session, format, filters, exported_at, summary)
 
                 return ExportResult(
                     success=True,
                     format=format,
                     data=export_data,
                     summary=summary,
-                    export_date=datetime.now().isoformat(),
+                    export_date=exported_at,
                     user_id=user_id,
+                    file_path=output_path,
                 )
 
             except Exception as e:
@@ -117,18 +189,11 @@ class AsyncExportService:
 
         async with get_async_session_context() as session:
             try:
-                # Get all sessions for user
-                sessions_stmt = select(WorkoutSession).where(
-                    WorkoutSession.user_id == user_id,
-                ).options(
-                    joinedload(WorkoutSession.exercises),
-                    joinedload(WorkoutSession.aerobics),
+                status_rows, total_resistance, total_aerobic = await self._count_user_data(
+                    session, self._session_filters(user_id),
                 )
 
-                result = await session.execute(sessions_stmt)
-                sessions = result.scalars().unique().all()
-
-                if not sessions:
+                if not status_rows:
                     return ExportPreview(
                         total_sessions=0,
                         completed_sessions=0,
@@ -140,26 +205,19 @@ class AsyncExportService:
                         estimated_size_mb=0.0,
                     )
 
-                # Calculate summary
-                completed_sessions = len([s for s in sessions if s.status == SessionStatus.FINALIZADA])
-                active_sessions = len([s for s in sessions if s.status == SessionStatus.ATIVA])
-
-                total_resistance = sum(len(s.exercises) for s in sessions)
-                total_aerobic = sum(len(s.aerobics) for s in sessions)
+                counts = {row.status: row.count for row in status_rows}
+                total_sessions = sum(counts.values())
+                completed_sessions = counts.get(SessionStatus.FINALIZADA, 0)
+                active_sessions = counts.get(SessionStatus.ATIVA, 0)
                 total_exercises = total_resistance + total_aerobic
 
-                # Date range
-                dates = [s.date for s in sessions]
-                date_range = DateRange(
-                    start=min(dates).strftime("%d/%m/%Y"),
-                    end=max(dates).strftime("%d/%m/%Y"),
-                ) if dates else None
+                date_range = self._aggregate_date_range(status_rows)
 
                 # Estimate export size (rough calculation)
-                estimated_size_mb = await self._estimate_export_size(sessions)
+                estimated_size_mb = await self._estimate_export_size(total_sessions, total_exercises)
 
                 return ExportPreview(
-                    total_sessions=len(sessions),
+                    total_sessions=total_sessions,
                     completed_sessions=completed_sessions,
                     active_sessions=active_sessions,
                     total_exercises=total_exercises,
@@ -173,197 +231,419 @@ class AsyncExportService:
                 logger.exception(f"Error getting export summary for user {user_id}")
                 raise DatabaseError(f"Failed to get export summary: {e!s}")
 
-    async def _get_user_sessions(
+    def _session_filters(
         self,
-        session,
         user_id: str,
-        start_date: Optional[date],
-        end_date: Optional[date],
-        include_active: bool,
-    ) -> List[WorkoutSession]:
-        """Get user sessions with filters (async)"""
-        # Build query
-        stmt = select(WorkoutSession).where(
-            WorkoutSession.user_id == user_id,
-        ).options(
-            joinedload(WorkoutSession.exercises).joinedload(WorkoutExercise.exercise),
-            joinedload(WorkoutSession.aerobics).joinedload(AerobicExercise.exercise),
-        )
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        include_active: bool = True,
+    ) -> List[ColumnElement[bool]]:
+        """Build the WHERE clauses selecting a user's sessions for export"""
+        filters = [WorkoutSession.user_id == user_id]
 
-        # Add date filters
+        # Date filters
         if start_date:
-            stmt = stmt.where(WorkoutSession.date >= start_date)
+            filters.append(WorkoutSession.date >= start_date)
         if end_date:
-            stmt = stmt.where(WorkoutSession.date <= end_date)
+            filters.append(WorkoutSession.date <= end_date)
 
-        # Add status filter
+        # Status filter
         if not include_active:
-            stmt = stmt.where(WorkoutSession.status == SessionStatus.FINALIZADA)
-
-        # Order by date
-        stmt = stmt.order_by(WorkoutSession.date.desc())
-
-        result = await session.execute(stmt)
-        return result.scalars().unique().all()
-
-    async def _export_to_json(self, sessions: List[WorkoutSession]) -> str:
-        """Export sessions to JSON format (async)"""
-        export_data = {
-            "export_info": {
-                "format": "json",
-                "export_date": datetime.now().isoformat(),
-                "total_sessions": len(sessions),
-            },
-            "sessions": [],
-        }
+            filters.append(WorkoutSession.status == SessionStatus.FINALIZADA)
 
-        for session in sessions:
-            session_data = {
-                "session_id": session.session_id,
-                "date": session.date.isoformat(),
-                "status": session.status.value,
-                "duration_minutes": session.duration_minutes,
-                "notes": session.notes,
-                "created_at": session.created_at.isoformat(),
-                "workout_exercises": [],
-                "aerobic_exercises": [],
-            }
+        return filters
 
-            # Add workout exercises
-            for we in session.exercises:
-                exercise_data = {
-                    "exercise_name": we.exercise.name if we.exercise else "Unknown",
-                    "muscle_group": we.exercise.muscle_group if we.exercise else None,
-                    "equipment": we.exercise.equipment if we.exercise else None,
-                    "sets": we.sets,
-                    "reps": we.reps,
-                    "weight": we.weights_kg,
-                    "rest_seconds": we.rest_seconds,
-                    "notes": we.notes,
-                }
-                session_data["workout_exercises"].append(exercise_data)
-
-            # Add aerobic exercises
-            for ae in session.aerobics:
-                aerobic_data = {
-                    "exercise_name": ae.exercise.name if ae.exercise else "Unknown",
-                    "duration_minutes": ae.duration_minutes,
-                    "distance_km": ae.distance_km,
-                    "calories_burned": ae.calories_burned,
-                    "intensity_level": ae.intensity_level,
-                    "notes": ae.notes,
-                }
-                session_data["aerobic_exercises"].append(aerobic_data)
-
-            export_data["sessions"].append(session_data)
-
-        return json.dumps(export_data, indent=2, ensure_ascii=False)
-
-    async def _export_to_csv(self, sessions: List[WorkoutSession]) -> str:
-        """Export sessions to CSV format (async)"""
-        output = StringIO()
-
-        # Create CSV writer
-        fieldnames = [
-            "session_id", "date", "status", "duration_minutes",
-            "exercise_type", "exercise_name", "muscle_group", "equipment",
-            "sets", "reps", "weight", "rest_seconds",
-            "duration_minutes_cardio", "distance_km", "calories", "intensity",
-            "notes",
-        ]
-
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for session in sessions:
-            base_row = {
-                "session_id": session.session_id,
-                "date": session.date.isoformat(),
-                "status": session.status.value,
-                "duration_minutes": session.duration_minutes,
-            }
+    async def _count_user_data(
+        self, session, filters: List[ColumnElement[bool]],
+    ) -> Tuple[Sequence[Row], int, int]:
+        """Aggregate session and exercise counts in SQL (async)
+
+        Returns:
+            Per-status rows (status, count, first_date, last_date, duration)
+            plus the resistance and aerobic exercise totals
+
+        """
+        status_stmt = select(
+            WorkoutSession.status,
+            func.count().label("count"),
+            func.min(WorkoutSession.date).label("first_date"),
+            func.max(WorkoutSession.date).label("last_date"),
+            func.sum(WorkoutSession.duration_minutes).label("duration"),
+        ).where(*filters).group_by(WorkoutSession.status)
+
+        status_rows = (await session.execute(status_stmt)).all()
+        if not status_rows:
+            return status_rows, 0, 0
+
+        total_resistance = await session.scalar(
+            select(func.count()).select_from(WorkoutExercise).join(WorkoutSession).where(*filters),
+        )
+        total_aerobic = await session.scalar(
+            select(func.count()).select_from(AerobicExercise).join(WorkoutSession).where(*filters),
+        )
+        return status_rows, total_resistance, total_aerobic
+
+    def _aggregate_date_range(self, status_rows: Sequence[Row]) -> Optional[DateRange]:
+        """Date range covered by the rows returned from _count_user_data"""
+        first_dates = [row.first_date for row in status_rows if row.first_date]
+        last_dates = [row.last_date for row in status_rows if row.last_date]
+        if not first_dates:
+            return None
+        return DateRange(
+            start=min(first_dates).strftime("%d/%m/%Y"),
+            end=max(last_dates).strftime("%d/%m/%Y"),
+        )
+
+    async def _query_export_summary(
+        self, session, filters: List[ColumnElement[bool]],
+    ) -> ExportSummary:
+        """Calculate export summary statistics with aggregate queries (async)"""
+        status_rows, total_resistance, total_aerobic = await self._count_user_data(session, filters)
 
-            # Write workout exercises
-            for we in session.exercises:
-                row = base_row.copy()
-                row.update({
-                    "exercise_type": "resistance",
-                    "exercise_name": we.exercise.name if we.exercise else "Unknown",
-                    "muscle_group": we.exercise.muscle_group if we.exercise else None,
-                    "equipment": we.exercise.equipment if we.exercise else None,
-                    "sets": we.sets,
-                    "reps": we.reps,
-                    "weight": we.weights_kg,
-                    "rest_seconds": we.rest_seconds,
-                    "notes": we.notes,
-                })
-                writer.writerow(row)
-
-            # Write aerobic exercises
-            for ae in session.aerobics:
-                row = base_row.copy()
-                row.update({
-                    "exercise_type": "aerobic",
-                    "exercise_name": ae.exercise.name if ae.exercise else "Unknown",
-                    "duration_minutes_cardio": ae.duration_minutes,
-                    "distance_km": ae.distance_km,
-                    "calories": ae.calories_burned,
-                    "intensity": ae.intensity_level,
-                    "notes": ae.notes,
-                })
-                writer.writerow(row)
-
-            # If session has no exercises, write a row for the session itself
-            if not session.exercises and not session.aerobics:
-                row = base_row.copy()
-                row.update({"notes": session.notes})
-                writer.writerow(row)
-
-        return output.getvalue()
-
-    async def _calculate_export_summary(self, sessions: List[WorkoutSession]) -> ExportSummary:
-        """Calculate summary statistics for exported data (async)"""
-        total_sessions = len(sessions)
-        completed_sessions = len([s for s in sessions if s.status == SessionStatus.FINALIZADA])
-
-        total_resistance = sum(len(s.exercises) for s in sessions)
-        total_aerobic = sum(len(s.aerobics) for s in sessions)
-        total_exercises = total_resistance + total_aerobic
-
-        # Date range
-        dates = [s.date for s in sessions]
-        date_range = DateRange(
-            start=min(dates).strftime("%d/%m/%Y"),
-            end=max(dates).strftime("%d/%m/%Y"),
-        ) if dates else None
-
-        # Total duration
-        total_duration = sum(s.duration_minutes or 0 for s in sessions)
+        total_sessions = sum(row.count for row in status_rows)
+        completed_sessions = sum(
+            row.count for row in status_rows if row.status == SessionStatus.FINALIZADA
+        )
 
         return ExportSummary(
             total_sessions=total_sessions,
             completed_sessions=completed_sessions,
             active_sessions=total_sessions - completed_sessions,
-            total_exercises=total_exercises,
+            total_exercises=total_resistance + total_aerobic,
             resistance_exercises=total_resistance,
             aerobic_exercises=total_aerobic,
-            total_duration_minutes=total_duration,
-            date_range=date_range,
+            total_duration_minutes=sum(row.duration or 0 for row in status_rows),
+            date_range=self._aggregate_date_range(status_rows),
+        )
+
+    async def _export(
+        self,
+        session,
+        format: str,
+        filters: List[ColumnElement[bool]],
+        exported_at: str,
+        summary: ExportSummary,
+        output: Optional[IO[str]] = None,
+    ) -> Optional[bytes]:
+        """Run the exporter for ``format`` (async)
+
+        Writes to ``output`` when given and returns ``None``. Otherwise the
+        export is encoded to UTF-8 as it is written and returned as bytes,
+        ready to be sent as a file without another str -> bytes copy.
+        """
+        raw = None
+        if output is None:
+            raw = BytesIO()
+            output = TextIOWrapper(raw, encoding="utf-8", newline="", write_through=True)
+
+        if format == "json":
+            await self._export_to_json(session, filters, exported_at, summary.total_sessions, output)
+        else:  # csv
+            await self._export_to_csv(session, filters, output)
+
+        if raw is None:
+            return None
+        data = raw.getvalue()
+        output.detach()
+        return data
+
+    def _user_sessions_statement(self, filters: List[ColumnElement[bool]]) -> Select:
+        """ORM query loading the sessions to export with their exercises
+
+        Every level uses raiseload, so touching a column or relationship
+        that was not loaded here raises instead of silently issuing one
+        extra query per row (N+1).
+        """
+        stmt = select(WorkoutSession).where(*filters).options(
+            # Only the columns the exporters read are loaded
+            load_only(
+                WorkoutSession.date,
+                WorkoutSession.status,
+                WorkoutSession.duration_minutes,
+                WorkoutSession.notes,
+                WorkoutSession.created_at,
+                raiseload=True,
+            ),
+            raiseload("*"),
+            # selectinload keeps the two collections in separate flat queries
+            # instead of a sessions x exercises x aerobics joined product
+            selectinload(WorkoutSession.exercises).options(
+                load_only(
+                    WorkoutExercise.sets,
+                    WorkoutExercise.reps,
+                    WorkoutExercise.weights_kg,
+                    WorkoutExercise.rest_seconds,
+                    WorkoutExercise.notes,
+                    raiseload=True,
+                ),
+                joinedload(WorkoutExercise.exercise).load_only(
+                    Exercise.name, Exercise.muscle_group, Exercise.equipment, raiseload=True,
+                ),
+                raiseload("*"),
+            ),
+            selectinload(WorkoutSession.aerobics).options(
+                load_only(
+                    AerobicExercise.duration_minutes,
+                    AerobicExercise.distance_km,
+                    AerobicExercise.calories_burned,
+                    AerobicExercise.intensity_level,
+                    AerobicExercise.notes,
+                    raiseload=True,
+                ),
+                joinedload(AerobicExercise.exercise).load_only(Exercise.name, raiseload=True),
+                raiseload("*"),
+            ),
+        )
+
+        # Newest first
+        return stmt.order_by(WorkoutSession.date.desc(), WorkoutSession.session_id.desc())
+
+    async def _export_to_json(
+        self,
+        session,
+        filters: List[ColumnElement[bool]],
+        exported_at: str,
+        total_sessions: int,
+        buffer: IO[str],
+    ) -> None:
+        """Write sessions to ``buffer`` in JSON format (async)
+
+        Sessions are streamed from the database in batches and serialized
+        one per line as they arrive, so memory use stays bounded by the
+        batch size. Each batch is encoded and written in a worker thread.
+        """
+
+        export_info = {
+            "format": "json",
+            "export_date": exported_at,
+            "total_sessions": total_sessions,
+        }
+        buffer.write('{\n  "export_info": ')
+        buffer.write(json.dumps(export_info, ensure_ascii=False))
+        buffer.write(',\n  "sessions": [')
+
+        stmt = self._user_sessions_statement(filters).execution_options(yield_per=_JSON_SESSION_BATCH)
+        result = await session.stream_scalars(stmt)
+
+        written = 0
+        async for partition in result.partitions():
+            # Encoding is CPU-bound; keep it off the event loop
+            await asyncio.to_thread(self._write_json_batch, buffer, partition, written > 0)
+            written += len(partition)
+
+        buffer.write("\n  ]\n}\n" if written else "]\n}\n")
+
+        if written != total_sessions:
+            # Sessions changed between the summary query and the export
+            logger.warning(f"JSON export header says {total_sessions} sessions, wrote {written}")
+
+    def _write_json_batch(
+        self, buffer: IO[str], sessions: Sequence[WorkoutSession], continued: bool,
+    ) -> None:
+        """Encode a batch of loaded sessions as JSON lines and write them"""
+        encoded = ",\n    ".join(
+            json.dumps(self._session_to_dict(workout_session), ensure_ascii=False)
+            for workout_session in sessions
         )
+        buffer.write(",\n    " if continued else "\n    ")
+        buffer.write(encoded)
+
+    async def _export_raw(
+        self, session, filters: List[ColumnElement[bool]],
+    ) -> List[Dict[str, Any]]:
+        """Export sessions as plain dicts, skipping serialization (async)"""
+        stmt = self._user_sessions_statement(filters).execution_options(yield_per=_JSON_SESSION_BATCH)
+        result = await session.stream_scalars(stmt)
+
+        records = []
+        async for partition in result.partitions():
+            records.extend(map(self._session_to_dict, partition))
+        return records
+
+    def _session_to_dict(self, session: WorkoutSession) -> Dict[str, Any]:
+        """Build the JSON export representation of one session"""
+        session_data = {
+            "session_id": session.session_id,
+            "date": session.date.isoformat(),
+            "status": _STATUS_STR[session.status],
+            "duration_minutes": session.duration_minutes,
+            "notes": session.notes,
+            "created_at": session.created_at.isoformat(),
+            "workout_exercises": [],
+            "aerobic_exercises": [],
+        }
 
-    async def _estimate_export_size(self, sessions: List[WorkoutSession]) -> float:
+        # Add workout exercises (relationship attributes are read once per row)
+        for we in session.exercises:
+            exercise = we.exercise
+            exercise_data = {
+                "exercise_name": exercise.name if exercise else "Unknown",
+                "muscle_group": exercise.muscle_group if exercise else None,
+                "equipment": exercise.equipment if exercise else None,
+                "sets": we.sets,
+                "reps": we.reps,
+                "weight": we.weights_kg,
+                "rest_seconds": we.rest_seconds,
+                "notes": we.notes,
+            }
+            session_data["workout_exercises"].append(exercise_data)
+
+        # Add aerobic exercises
+        for ae in session.aerobics:
+            exercise = ae.exercise
+            aerobic_data = {
+                "exercise_name": exercise.name if exercise else "Unknown",
+                "duration_minutes": ae.duration_minutes,
+                "distance_km": ae.distance_km,
+                "calories_burned": ae.calories_burned,
+                "intensity_level": ae.intensity_level,
+                "notes": ae.notes,
+            }
+            session_data["aerobic_exercises"].append(aerobic_data)
+
+        return session_data
+
+    def _csv_rows_statement(self, filters: List[ColumnElement[bool]]) -> Select:
+        """Core query returning one flat row per exported exercise
+
+        Resistance and aerobic exercises are combined with UNION ALL and
+        outer-joined to the sessions, so sessions without exercises still
+        produce a single row with NULL exercise columns.
+        """
+        resistance = select(
+            WorkoutExercise.session_id,
+            literal(0).label("kind"),
+            WorkoutExercise.workout_exercise_id.label("item_id"),
+            WorkoutExercise.exercise_id,
+            WorkoutExercise.sets,
+            WorkoutExercise.reps,
+            WorkoutExercise.weights_kg,
+            WorkoutExercise.rest_seconds,
+            cast(null(), Float).label("cardio_minutes"),
+            cast(null(), Float).label("distance_km"),
+            cast(null(), Integer).label("calories"),
+            cast(null(), String).label("intensity"),
+            WorkoutExercise.notes,
+        )
+        aerobic = select(
+            AerobicExercise.session_id,
+            literal(1),
+            AerobicExercise.aerobic_id,
+            AerobicExercise.exercise_id,
+            null(),
+            null(),
+            null(),
+            null(),
+            AerobicExercise.duration_minutes,
+            AerobicExercise.distance_km,
+            AerobicExercise.calories_burned,
+            AerobicExercise.intensity_level,
+            AerobicExercise.notes,
+        )
+        items = union_all(resistance, aerobic).subquery()
+
+        return (
+            select(
+                WorkoutSession.session_id,
+                WorkoutSession.date,
+                WorkoutSession.status,
+                WorkoutSession.duration_minutes,
+                WorkoutSession.notes,
+                items.c.kind,
+                Exercise.name,
+                Exercise.muscle_group,
+                Exercise.equipment,
+                items.c.sets,
+                items.c.reps,
+                items.c.weights_kg,
+                items.c.rest_seconds,
+                items.c.cardio_minutes,
+                items.c.distance_km,
+                items.c.calories,
+                items.c.intensity,
+                items.c.notes,
+            )
+            .select_from(WorkoutSession)
+            .outerjoin(items, items.c.session_id == WorkoutSession.session_id)
+            .outerjoin(Exercise, Exercise.exercise_id == items.c.exercise_id)
+            .where(*filters)
+            # Newest session first; resistance before aerobic, in insertion order
+            .order_by(
+                WorkoutSession.date.desc(),
+                WorkoutSession.session_id.desc(),
+                items.c.kind,
+                items.c.item_id,
+            )
+        )
+
+    async def _export_to_csv(
+        self,
+        session,
+        filters: List[ColumnElement[bool]],
+        buffer: IO[str],
+    ) -> None:
+        """Write sessions to ``buffer`` in CSV format (async)
+
+        Rows are streamed as plain tuples from a Core query, skipping ORM
+        object construction, and each batch is encoded in a worker thread.
+        """
+        buffer.write(_csv_line(_CSV_HEADER))
+
+        # Rows are fetched in batches and written as they arrive
+        stmt = self._csv_rows_statement(filters).execution_options(yield_per=_CSV_ROW_BATCH)
+        result = await session.stream(stmt)
+        async for partition in result.partitions():
+            # Encoding is CPU-bound; keep it off the event loop
+            await asyncio.to_thread(buffer.writelines, self._iter_csv_lines(partition))
+
+    def _iter_csv_lines(self, rows: Iterable[Row]) -> Iterator[str]:
+        """Yield one encoded CSV line per row of the _csv_rows_statement query
+
+        The column layout is fixed, so each row kind is serialized by hand:
+        numeric and enum/date columns skip the quoting check and unused
+        columns are emitted as constant runs of commas. Output is identical
+        to csv.writer with the default dialect.
+        """
+        current_session_id = None
+        prefix = ""
+
+        for (
+            session_id, session_date, status, duration, session_notes,
+            kind, name, muscle_group, equipment,
+            sets, reps, weights, rest_seconds,
+            cardio_minutes, distance_km, calories, intensity, notes,
+        ) in rows:
+            # Session columns are shared by every row of the session, so
+            # encode them once instead of once per exercise
+            if session_id != current_session_id:
+                current_session_id = session_id
+                prefix = f"{session_id},{session_date.isoformat()},{_STATUS_STR[status]},{_csv_number(duration)},"
+
+            if kind is None:
+                # Session without exercises: a single row for the session itself
+                yield f"{prefix}{_NO_EXERCISE_FIELDS}{_csv_field(session_notes)}\r\n"
+            elif kind == 0:
+                yield (
+                    f"{prefix}resistance,{_csv_field(name if name is not None else 'Unknown')},"
+                    f"{_csv_field(muscle_group)},{_csv_field(equipment)},{_csv_number(sets)},"
+                    f"{_csv_list_field(tuple(reps)) if reps is not None else ''},"
+                    f"{_csv_list_field(tuple(weights)) if weights is not None else ''},"
+                    f"{_csv_number(rest_seconds)},{_NO_CARDIO_FIELDS}{_csv_field(notes)}\r\n"
+                )
+            else:
+                yield (
+                    f"{prefix}aerobic,{_csv_field(name if name is not None else 'Unknown')},"
+                    f"{_NO_RESISTANCE_FIELDS}{_csv_number(cardio_minutes)},{_csv_number(distance_km)},"
+                    f"{_csv_number(calories)},{_csv_field(intensity)},{_csv_field(notes)}\r\n"
+                )
+
+    async def _estimate_export_size(self, total_sessions: int, total_exercises: int) -> float:
         """Estimate export file size in MB (async)"""
         # Rough calculation based on data complexity
         base_size_per_session = 0.5  # KB
         base_size_per_exercise = 0.2  # KB
 
-        total_exercises = sum(
-            len(s.exercises) + len(s.aerobics)
-            for s in sessions
-        )
-
-        estimated_kb = (len(sessions) * base_size_per_session) + (total_exercises * base_size_per_exercise)
+        estimated_kb = (total_sessions * base_size_per_session) + (total_exercises * base_size_per_exercise)
         estimated_mb = estimated_kb / 1024
 
         return round(estimated_mb, 2)
-
@@ -1,19 +1,51 @@
 """Health check and monitoring service"""
 
+import asyncio
 import threading
 import time
-from collections import deque
+from array import array
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 
 import psutil
 from pydantic import BaseModel, Field, ConfigDict
+from sqlalchemy import bindparam, func, select, text
+from sqlalchemy.exc import SQLAlchemyError
 
 from config.logging_config import get_logger
 from config.settings import settings
+from database.async_connection import get_health_session_context
+from database.models import SessionStatus, User, WorkoutSession
 
 logger = get_logger(__name__)
 
+_MB = 1024 * 1024
+_GB = _MB * 1024
+
+# Per-attempt timeouts for the database probe; one retry per extra entry
+_DB_PROBE_TIMEOUTS = (1.0, 2.0, 4.0)
+_DB_PROBE_BACKOFF_SECONDS = 0.1
+
+# Statements are built once; only the date parameter is bound per call
+_SELECT_1 = text("SELECT 1")
+_DATABASE_STATS_STMT = select(
+    select(func.count(User.user_id)).where(User.is_active == True).scalar_subquery(),
+    select(func.count(WorkoutSession.session_id)).scalar_subquery(),
+    select(func.count(WorkoutSession.session_id)).where(
+        WorkoutSession.date == bindparam("today"),
+    ).scalar_subquery(),
+)
+_ACTIVE_SESSIONS_STMT = select(func.count(WorkoutSession.session_id)).where(
+    WorkoutSession.status == SessionStatus.ATIVA,
+)
+
+# How long a psutil reading is reused; disk usage barely moves between probes
+_PSUTIL_SAMPLE_TTL_SECONDS = {
+    "cpu": 1.0,
+    "memory": 5.0,
+    "disk": 60.0,
+}
+
 
 class HealthStatus(BaseModel):
     """Health status data model"""
@@ -66,38 +98,70 @@ class BotMetrics(BaseModel):
     active_sessions: int = Field(..., ge=0, description="Number of active workout sessions")
 
 
+def _flat_dump(model: BaseModel) -> Dict[str, Any]:
+    """Shallow-copy the fields of a flat metrics model
+
+    The metrics models only hold validated scalars, so copying __dict__
+    gives the same result as model_dump() without the serializer pass.
+    """
+    return model.__dict__.copy()
+
+
 class HealthService:
     """Service for health checks and metrics collection"""
 
     def __init__(self):
-        self.start_time = time.time()
+        # Monotonic so wall-clock adjustments can't skew the uptime
+        self.start_time = time.monotonic()
         self.command_count = 0
         self.audio_count = 0
         self.error_count = 0
-        self.response_times = []
         self.max_response_times = 1000  # Keep last 1000 response times
-        self.response_times = deque(maxlen=self.max_response_times)
         self._metrics_lock = threading.RLock()
-        self._response_time_sum = 0.0
-        self._response_time_count = 0
+        # Fixed-size ring buffer: O(1) writes, no reallocation
+        self._rt = array("d", [0.0] * self.max_response_times)
+        self._rt_idx = 0
+        self._rt_filled = 0
+        self._rt_sum = 0.0
+        # Short-lived report cache so frequent probes don't rerun every check
+        self._cache_ttl = {
+            "full": settings.HEALTH_CACHE_TTL_SECONDS,
+            "simple": settings.HEALTH_SIMPLE_CACHE_TTL_SECONDS,
+        }
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        # Created on first use: the module-level instance exists at import time,
+        # before any event loop is running
+        self._cache_locks: Dict[str, asyncio.Lock] = {}
+        # Throttled psutil readings: name -> (taken_at, value)
+        self._psutil_lock = threading.Lock()
+        self._psutil_samples: Dict[str, Tuple[float, Any]] = {}
+        # Prime the non-blocking CPU counter so the first real sample is meaningful
+        psutil.cpu_percent(interval=None)
+
+    @property
+    def response_times(self) -> list[float]:
+        """Recorded response times, oldest first"""
+        with self._metrics_lock:
+            if self._rt_filled < self.max_response_times:
+                return self._rt[:self._rt_filled].tolist()
+            return (self._rt[self._rt_idx:] + self._rt[:self._rt_idx]).tolist()
+
+    def _record_response_time(self, response_time_ms: float) -> None:
+        """Store a response time in the ring buffer, evicting the oldest one"""
+        # Sanitize response time to ensure it's non-negative
+        sanitized_time = max(0.0, response_time_ms)
+
+        idx = self._rt_idx
+        self._rt_sum += sanitized_time - self._rt[idx]
+        self._rt[idx] = sanitized_time
+        self._rt_idx = (idx + 1) % self.max_response_times
+        if self._rt_filled < self.max_response_times:
+            self._rt_filled += 1
 
     def record_command(self, response_time_ms: float, is_error: bool = False):
         with self._metrics_lock:
             self.command_count += 1
-
-            # Sanitize response time to ensure it's non-negative
-            sanitized_time = max(0.0, response_time_ms)
-
-            old_value = None
-            if len(self.response_times) == self.max_response_times:
-                old_value = self.response_times[0]
-
-            self.response_times.append(sanitized_time)
-
-            self._response_time_sum += sanitized_time
-            if old_value is not None:
-                self._response_time_sum -= old_value
-            self._response_time_count = len(self.response_times)
+            self._record_response_time(response_time_ms)
 
             if is_error:
                 self.error_count += 1
@@ -105,19 +169,18 @@ class HealthService:
     def get_average_response_time(self) -> float:
         """Get average with O(1) complexity"""
         with self._metrics_lock:
-            if self._response_time_count == 0:
+            if self._rt_filled == 0:
                 return 0.0
-            # O(1) em vez de O(n) como era antes
-            return self._response_time_sum / self._response_time_count
+            return self._rt_sum / self._rt_filled
 
     def get_percentile_response_time(self, percentile: float = 0.95) -> float:
         """Get percentile with optimized sorting"""
         with self._metrics_lock:
-            if not self.response_times:
+            if self._rt_filled == 0:
                 return 0.0
 
-            # Cópia shallow apenas quando necessário
-            sorted_times = sorted(self.response_times)
+            # Slot order doesn't matter once sorted
+            sorted_times = sorted(self._rt[:self._rt_filled])
             index = int(len(sorted_times) * percentile)
             return sorted_times[min(index, len(sorted_times) - 1)]
 
@@ -125,50 +188,89 @@ class HealthService:
         """Record audio processing"""
         with self._metrics_lock:
             self.audio_count += 1
+            self._record_response_time(response_time_ms)
 
-            # Sanitize response time to ensure it's non-negative
-            sanitized_time = max(0.0, response_time_ms)
+            if is_error:
+                self.error_count += 1
 
-            old_value = None
-            if len(self.response_times) == self.max_response_times:
-                old_value = self.response_times[0]
+    def _psutil_reading(self, name: str, read: Callable[[], Any]) -> Any:
+        """Return a cached psutil reading, refreshing it once its TTL passes"""
+        now = time.monotonic()
+        sample = self._psutil_samples.get(name)
+        if sample is not None and now - sample[0] < _PSUTIL_SAMPLE_TTL_SECONDS[name]:
+            return sample[1]
+
+        value = read()
+        self._psutil_samples[name] = (now, value)
+        return value
+
+    def _sample_psutil(self) -> Tuple[float, Any, Any]:
+        """Get CPU, memory and disk usage without blocking
+
+        cpu_percent(interval=None) reports usage since the previous call
+        instead of sleeping for a second. Each reading is reused for its
+        _PSUTIL_SAMPLE_TTL_SECONDS entry.
+        """
+        with self._psutil_lock:
+            return (
+                self._psutil_reading("cpu", lambda: psutil.cpu_percent(interval=None)),
+                self._psutil_reading("memory", psutil.virtual_memory),
+                self._psutil_reading("disk", lambda: psutil.disk_usage("/")),
+            )
 
-            self.response_times.append(sanitized_time)
+    async def _get_cached(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached result for key, recomputing it once it expires"""
+        ttl = self._cache_ttl[key]
+        if ttl <= 0:
+            return await compute()
 
-            self._response_time_sum += sanitized_time
-            if old_value is not None:
-                self._response_time_sum -= old_value
-            self._response_time_count = len(self.response_times)
+        entry = self._cache.get(key)
+        if entry is not None and time.monotonic() < entry[0]:
+            return entry[1]
 
-            if is_error:
-                self.error_count += 1
+        lock = self._cache_locks.get(key)
+        if lock is None:
+            lock = self._cache_locks[key] = asyncio.Lock()
 
-    async def get_health_status(self) -> HealthStatus:
-        """Get comprehensive health status"""
-        try:
-            start_time = time.time()
+        async with lock:
+            # Another caller may have refreshed it while we waited
+            entry = self._cache.get(key)
+            if entry is not None and time.monotonic() < entry[0]:
+                return entry[1]
 
-            # Run all health checks
-            checks = await self._run_health_checks()
+            result = await compute()
+            self._cache[key] = (time.monotonic() + ttl, result)
+            return result
 
-            # Collect metrics
-            metrics = await self._collect_metrics()
+    async def get_health_status(self) -> HealthStatus:
+        """Get comprehensive health status (cached for HEALTH_CACHE_TTL_SECONDS)"""
+        return await self._get_cached("full", self._build_health_status)
+
+    async def _build_health_status(self) -> HealthStatus:
+        """Run checks and collect metrics into a fresh health status"""
+        # One wall-clock/uptime snapshot per report, shared by both branches
+        now = datetime.now()
+        started = time.monotonic()
+        uptime = int(started - self.start_time)
+        try:
+            # Checks and metrics are independent; run them side by side
+            checks, metrics = await asyncio.gather(
+                self._run_health_checks(),
+                self._collect_metrics(),
+            )
 
             # Determine overall status
             overall_status = self._determine_overall_status(checks)
 
-            # Calculate uptime
-            uptime = int(time.time() - self.start_time)
-
             health_status = HealthStatus(
                 status=overall_status,
-                timestamp=datetime.now(),
+                timestamp=now,
                 uptime_seconds=uptime,
                 checks=checks,
                 metrics=metrics,
             )
 
-            check_time = (time.time() - start_time) * 1000
+            check_time = (time.monotonic() - started) * 1000
             logger.debug(f"Health check completed in {check_time:.2f}ms")
 
             return health_status
@@ -177,107 +279,88 @@ class HealthService:
             logger.exception("Error during health check")
             return HealthStatus(
                 status="unhealthy",
-                timestamp=datetime.now(),
-                uptime_seconds=int(time.time() - self.start_time),
+                timestamp=now,
+                uptime_seconds=uptime,
                 checks={"health_check_error": str(e)},
                 metrics={},
             )
 
     async def _run_health_checks(self) -> Dict[str, Any]:
-        """Run all health checks"""
-        checks = {}
-
-        # Database connectivity check
-        checks["database"] = await self._check_database()
-
-        # Async database check
-        checks["async_database"] = await self._check_async_database()
-
-        # System resources check
-        checks["system_resources"] = self._check_system_resources()
+        """Run all health checks concurrently"""
+        names = ("database", "system_resources", "configuration", "dependencies")
+        results = await asyncio.gather(
+            self._check_database(),
+            # Sync checks run in threads so they don't block the DB probes
+            asyncio.to_thread(self._check_system_resources),
+            asyncio.to_thread(self._check_configuration),
+            asyncio.to_thread(self._check_dependencies),
+            return_exceptions=True,
+        )
 
-        # Configuration check
-        checks["configuration"] = self._check_configuration()
+        checks = {}
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                logger.error(f"Health check '{name}' raised: {result}")
+                result = {
+                    "status": "unhealthy",
+                    "message": f"Health check failed: {result!s}",
+                }
+            checks[name] = result
 
-        # Dependencies check
-        checks["dependencies"] = self._check_dependencies()
+        # Both keys used to run their own SELECT 1; one round-trip answers both
+        checks["async_database"] = checks["database"]
 
         return checks
 
-    async def _check_database(self) -> Dict[str, Any]:
-        """Check database connectivity and performance"""
-        try:
-            start_time = time.time()
-
-            # Test database connection
-            from sqlalchemy import text
-
-            from database.async_connection import get_async_session_context
-
-            async with get_async_session_context() as session:
-                # Simple query to test connectivity
-                result = await session.execute(text("SELECT 1"))
-                value = result.scalar()
-
-                response_time = (time.time() - start_time) * 1000
+    async def _probe_database(self, timeout: float) -> Any:
+        """Run SELECT 1 on the health engine, bounded by timeout"""
+        async with get_health_session_context() as session:
+            result = await asyncio.wait_for(session.execute(_SELECT_1), timeout=timeout)
+            return result.scalar()
 
-            return {
-                "status": "healthy" if value else "unhealthy",
-                "response_time_ms": round(response_time, 2),
-                "message": "Database connection successful",
-            }
-
-        except Exception as e:
-            response_time = (time.time() - start_time) * 1000
-            logger.exception("Database health check failed")
-            return {
-                "status": "unhealthy",
-                "response_time_ms": round(response_time, 2),
-                "message": f"Database connection failed: {e!s}",
-            }
-
-    async def _check_async_database(self) -> Dict[str, Any]:
-        """Check async database connectivity"""
+    async def _check_database(self) -> Dict[str, Any]:
+        """Check database connectivity and performance
+
+        Each attempt is bounded by a growing timeout and transient failures
+        are retried with exponential backoff, so a brief database stall
+        doesn't mark the bot unhealthy or hang the health report.
+        """
+        start_time = time.time()
+        last_error: Optional[BaseException] = None
         try:
-            start_time = time.time()
-
-            # Test async database connection
-            from sqlalchemy import text
-
-            from database.async_connection import get_async_session_context
-
-            async with get_async_session_context() as session:
-                result = await session.execute(text("SELECT 1"))
-                value = result.scalar()
+            for attempt, timeout in enumerate(_DB_PROBE_TIMEOUTS):
+                if attempt:
+                    await asyncio.sleep(_DB_PROBE_BACKOFF_SECONDS * 2 ** (attempt - 1))
+                try:
+                    value = await self._probe_database(timeout)
+                except (asyncio.TimeoutError, SQLAlchemyError, OSError) as e:
+                    last_error = e
+                    logger.warning(f"Database health probe attempt {attempt + 1} failed: {e!r}")
+                    continue
 
                 response_time = (time.time() - start_time) * 1000
-
                 return {
-                    "status": "healthy" if value == 1 else "unhealthy",
+                    "status": "healthy" if value else "unhealthy",
                     "response_time_ms": round(response_time, 2),
-                    "message": "Async database connection successful",
+                    "attempts": attempt + 1,
+                    "message": "Database connection successful",
                 }
 
+            raise last_error
+
         except Exception as e:
             response_time = (time.time() - start_time) * 1000
-            logger.exception("Async database health check failed")
+            logger.exception("Database health check failed")
             return {
                 "status": "unhealthy",
                 "response_time_ms": round(response_time, 2),
-                "message": f"Async database connection failed: {e!s}",
+                "message": f"Database connection failed: {str(e) or type(e).__name__}",
             }
 
     def _check_system_resources(self) -> Dict[str, Any]:
         """Check system resource usage"""
         try:
-            # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
-
-            # Memory usage
-            memory = psutil.virtual_memory()
-
-            # Disk usage
-            disk = psutil.disk_usage("/")
+            cpu_percent, memory, disk = self._sample_psutil()
 
             # Determine status based on thresholds
             status = "healthy"
@@ -382,13 +465,13 @@ class HealthService:
             metrics = {}
 
             # System metrics
-            metrics["system"] = self._get_system_metrics().model_dump()
+            metrics["system"] = _flat_dump(self._get_system_metrics())
 
             # Database metrics
-            metrics["database"] = (await self._get_database_metrics()).model_dump()
+            metrics["database"] = _flat_dump(await self._get_database_metrics())
 
             # Bot metrics (async version to get active sessions)
-            metrics["bot"] = (await self._get_bot_metrics_async()).model_dump()
+            metrics["bot"] = _flat_dump(await self._get_bot_metrics_async())
 
             return metrics
 
@@ -398,27 +481,16 @@ class HealthService:
 
     def _get_system_metrics(self) -> SystemMetrics:
         """Get system performance metrics"""
-        # CPU
-        cpu_percent = psutil.cpu_percent()
-
-        # Memory
-        memory = psutil.virtual_memory()
-        memory_used_mb = memory.used / (1024 * 1024)
-        memory_total_mb = memory.total / (1024 * 1024)
-
-        # Disk
-        disk = psutil.disk_usage("/")
-        disk_used_gb = disk.used / (1024 * 1024 * 1024)
-        disk_total_gb = disk.total / (1024 * 1024 * 1024)
+        cpu_percent, memory, disk = self._sample_psutil()
 
         return SystemMetrics(
             cpu_percent=cpu_percent,
             memory_percent=memory.percent,
-            memory_used_mb=round(memory_used_mb),
-            memory_total_mb=round(memory_total_mb),
+            memory_used_mb=round(memory.used / _MB),
+            memory_total_mb=round(memory.total / _MB),
             disk_percent=disk.percent,
-            disk_used_gb=round(disk_used_gb, 2),
-            disk_total_gb=round(disk_total_gb, 2),
+            disk_used_gb=round(disk.used / _GB, 2),
+            disk_total_gb=round(disk.total / _GB, 2),
         )
 
     async def _get_database_metrics(self) -> DatabaseMetrics:
@@ -426,29 +498,12 @@ class HealthService:
         try:
             start_time = time.time()
 
-            # Test database response time
-            from sqlalchemy import func, select
-
-            from database.async_connection import get_async_session_context
-            from database.models import User, WorkoutSession
-
-            async with get_async_session_context() as session:
-                # Query some basic stats
-                user_count_stmt = select(func.count(User.user_id)).where(User.is_active == True)
-                user_result = await session.execute(user_count_stmt)
-                user_count = user_result.scalar()
-
-                session_count_stmt = select(func.count(WorkoutSession.session_id))
-                session_result = await session.execute(session_count_stmt)
-                total_sessions = session_result.scalar()
-
-                # Sessions today
+            async with get_health_session_context() as session:
+                # All three counts as scalar subqueries: one round-trip
                 today = datetime.now().date()
-                sessions_today_stmt = select(func.count(WorkoutSession.session_id)).where(
-                    WorkoutSession.date == today,
-                )
-                today_result = await session.execute(sessions_today_stmt)
-                sessions_today = today_result.scalar()
+                user_count, total_sessions, sessions_today = (
+                    await session.execute(_DATABASE_STATS_STMT, {"today": today})
+                ).one()
 
                 response_time = (time.time() - start_time) * 1000
 
@@ -475,13 +530,19 @@ class HealthService:
 
     async def _get_bot_metrics_async(self) -> BotMetrics:
         """Get bot-specific metrics with async database queries"""
-        # Calculate average response time
-        avg_response_time = self.get_average_response_time()
+        # Snapshot counters and timings together so they describe the same
+        # moment; records may land while we await the database below
+        with self._metrics_lock:
+            command_count = self.command_count
+            audio_count = self.audio_count
+            error_count = self.error_count
+            avg_response_time = self.get_average_response_time()
+            percentile_response_time = self.get_percentile_response_time()
 
         # Calculate error rate
-        total_operations = self.command_count + self.audio_count
+        total_operations = command_count + audio_count
         error_rate = (
-            (self.error_count / total_operations * 100)
+            (error_count / total_operations * 100)
             if total_operations > 0 else 0
         )
 
@@ -489,10 +550,10 @@ class HealthService:
         active_sessions_count = await self._get_active_sessions_count()
 
         return BotMetrics(
-            total_commands_processed=self.command_count,
-            total_audio_processed=self.audio_count,
+            total_commands_processed=command_count,
+            total_audio_processed=audio_count,
             average_response_time_ms=round(avg_response_time, 2),
-            percentile_response_time_ms=self.get_percentile_response_time(),
+            percentile_response_time_ms=percentile_response_time,
             error_rate_percent=round(error_rate, 2),
             active_sessions=active_sessions_count,
         )
@@ -500,17 +561,9 @@ class HealthService:
     async def _get_active_sessions_count(self) -> int:
         """Get count of active workout sessions"""
         try:
-            from sqlalchemy import func, select
-
-            from database.async_connection import get_async_session_context
-            from database.models import SessionStatus, WorkoutSession
-
-            async with get_async_session_context() as session:
+            async with get_health_session_context() as session:
                 # Count sessions with status 'ativa' (active)
-                active_sessions_stmt = select(func.count(WorkoutSession.session_id)).where(
-                    WorkoutSession.status == SessionStatus.ATIVA,
-                )
-                result = await session.execute(active_sessions_stmt)
+                result = await session.execute(_ACTIVE_SESSIONS_STMT)
                 count = result.scalar()
                 return count or 0
 
@@ -520,43 +573,39 @@ class HealthService:
 
     def _determine_overall_status(self, checks: Dict[str, Any]) -> str:
         """Determine overall health status from individual checks"""
-        statuses = []
-
-        for check_name, check_result in checks.items():
-            if isinstance(check_result, dict) and "status" in check_result:
-                statuses.append(check_result["status"])
+        seen_degraded = False
 
-        # If any check is unhealthy, overall is unhealthy
-        if "unhealthy" in statuses:
-            return "unhealthy"
+        for check_result in checks.values():
+            if isinstance(check_result, dict):
+                status = check_result.get("status")
+                # If any check is unhealthy, overall is unhealthy
+                if status == "unhealthy":
+                    return "unhealthy"
+                if status == "degraded":
+                    seen_degraded = True
 
-        # If any check is degraded, overall is degraded
-        if "degraded" in statuses:
-            return "degraded"
-
-        # Otherwise, healthy
-        return "healthy"
+        return "degraded" if seen_degraded else "healthy"
 
     async def get_simple_health(self) -> Dict[str, Any]:
-        """Get simple health status for quick checks"""
+        """Get simple health status for quick checks (cached for HEALTH_SIMPLE_CACHE_TTL_SECONDS)"""
+        return await self._get_cached("simple", self._build_simple_health)
+
+    async def _build_simple_health(self) -> Dict[str, Any]:
+        """Run the quick system and database checks"""
+        timestamp = datetime.now().isoformat()
+        uptime = int(time.monotonic() - self.start_time)
         try:
             # Quick system check
-            cpu = psutil.cpu_percent()
-            memory = psutil.virtual_memory()
+            cpu, memory, _ = self._sample_psutil()
 
             # Quick database check
             try:
-                from sqlalchemy import text
-
-                from database.async_connection import get_async_session_context
-                async with get_async_session_context() as session:
-                    await session.execute(text("SELECT 1"))
+                async with get_health_session_context() as session:
+                    await session.execute(_SELECT_1)
                 db_status = "healthy"
-            except:
+            except Exception:
                 db_status = "unhealthy"
 
-            uptime = int(time.time() - self.start_time)
-
             status = "healthy"
             if cpu > 90 or memory.percent > 90 or db_status == "unhealthy":
                 status = "unhealthy"
@@ -566,7 +615,7 @@ class HealthService:
             return {
                 "status": status,
                 "uptime_seconds": uptime,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": timestamp,
                 "checks": {
                     "database": db_status,
                     "cpu_ok": cpu < 80,
@@ -579,7 +628,7 @@ class HealthService:
             return {
                 "status": "unhealthy",
                 "error": str(e),
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": timestamp,
             }
 
 
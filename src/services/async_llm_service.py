@@ -1,7 +1,14 @@
-import json
-from typing import Any, Dict
-
-from groq import AsyncGroq
+import asyncio
+import copy
+import hashlib
+import re
+import threading
+from typing import Any, Dict, Optional
+
+from aiolimiter import AsyncLimiter
+import orjson
+from cachetools import TTLCache
+from groq import APIStatusError, APITimeoutError, AsyncGroq, AuthenticationError, RateLimitError
 
 from config.logging_config import get_logger
 from config.settings import settings
@@ -10,227 +17,37 @@ from services.workout_validation import validate_workout_data, get_user_friendly
 
 logger = get_logger(__name__)
 
+_WHITESPACE_RE = re.compile(r"\s+")
 
-class LLMParsingService:
-    """Serviço para parsear transcrições usando Groq API"""
-
-    def __init__(self) -> None:
-
-        logger.info("Inicializando Groq LLM...")
-
-        if not settings.GROQ_API_KEY:
-            raise ServiceUnavailableError(
-                "GROQ_API_KEY não configurada",
-                "Configure a variável de ambiente GROQ_API_KEY",
-                error_code=ErrorCode.GROQ_API_ERROR,
-            )
-
-        try:
-            self.client = AsyncGroq(api_key=settings.GROQ_API_KEY)
-            self.model = settings.LLM_MODEL
-            logger.info(f"LLM Service inicializado: {self.model} (Async Groq API)")
-        except Exception as e:
-            raise ServiceUnavailableError(
-                "Falha ao inicializar cliente Groq LLM",
-                f"Erro: {e!s}",
-                error_code=ErrorCode.GROQ_API_ERROR,
-            )
-
-    async def parse_workout(self, transcription: str) -> Dict[str, Any]:
-        """Parse uma transcrição de treino usando Groq API
-        
-        Args:
-            transcription: Texto transcrito do áudio
-            
-        Returns:
-            Dict com dados estruturados do treino
-            
-        Raises:
-            ValidationError: Se a transcrição é inválida
-            LLMParsingError: Se o parsing falhar
-            ServiceUnavailableError: Se o serviço Groq estiver indisponível
-
-        """
-        if not transcription or not transcription.strip():
-            raise ValidationError(
-                message="Transcrição vazia ou inválida",
-                field="transcription",
-                value=transcription,
-                error_code=ErrorCode.MISSING_REQUIRED_FIELD,
-                user_message="Por favor, envie um áudio com conteúdo válido",
-            )
-
-        if len(transcription) > settings.MAX_TRANSCRIPTION_LENGTH:
-            raise ValidationError(
-                message=f"Transcrição muito longa (máximo {settings.MAX_TRANSCRIPTION_LENGTH:,} caracteres)",
-                field="transcription",
-                value=len(transcription),
-                error_code=ErrorCode.VALUE_OUT_OF_RANGE,
-                user_message=f"Áudio muito longo. Máximo permitido: {settings.MAX_TRANSCRIPTION_LENGTH:,} caracteres",
-            )
-
-        prompt = self._build_prompt(transcription)
+# Cliente Groq compartilhado entre instâncias do serviço, para que o pool de
+# conexões HTTP (keep-alive, TLS) seja reaproveitado entre requisições
+_groq_client: Optional[AsyncGroq] = None
+_groq_client_lock = threading.Lock()
 
-        logger.info(f"Enviando transcrição para Groq API ({self.model})...")
 
-        try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[{
-                    "role": "user",
-                    "content": prompt,
-                }],
-                temperature=settings.LLM_TEMPERATURE,
-                max_completion_tokens=settings.LLM_MAX_TOKENS,
-            )
+def _get_groq_client(api_key: str, max_retries: int) -> AsyncGroq:
+    """Retorna o cliente Groq compartilhado, criando-o se necessário
 
-            if not response.choices or not response.choices[0].message:
-                raise LLMParsingError(
-                    message="Resposta vazia do LLM",
-                    details="O modelo não retornou uma resposta válida",
-                    model=self.model,
-                    error_code=ErrorCode.LLM_INVALID_RESPONSE,
-                    user_message="O sistema de IA não conseguiu processar o áudio. Tente novamente.",
-                )
+    O SDK já refaz as requisições com backoff exponencial e jitter em 429,
+    408/409, erros 5xx e falhas de conexão (respeitando o header retry-after);
+    erros de autenticação nunca são repetidos.
+    """
+    global _groq_client
+    with _groq_client_lock:
+        if (
+            _groq_client is None
+            or _groq_client.is_closed()
+            or _groq_client.api_key != api_key
+            or _groq_client.max_retries != max_retries
+        ):
+            _groq_client = AsyncGroq(api_key=api_key, max_retries=max_retries)
+        return _groq_client
 
-            content = response.choices[0].message.content
-            if not content:
-                raise LLMParsingError(
-                    message="Conteúdo vazio na resposta do LLM",
-                    details="O modelo retornou uma resposta vazia",
-                    model=self.model,
-                    error_code=ErrorCode.LLM_INVALID_RESPONSE,
-                    user_message="O sistema de IA retornou uma resposta vazia. Tente novamente.",
-                )
-
-            # Limpar markdown se presente
-            content = content.replace("```json", "").replace("```", "").strip()
 
-            # Parsear JSON
-            try:
-                parsed_data = json.loads(content)
-            except json.JSONDecodeError as e:
-                logger.error(f"Erro ao parsear JSON: {e}")
-                logger.error(f"Resposta do Groq: {content[:500]}...")
-                raise LLMParsingError(
-                    message="Resposta do LLM não é JSON válido",
-                    details=f"Erro de parsing: {e!s}",
-                    model=self.model,
-                    response=content,
-                    error_code=ErrorCode.LLM_INVALID_RESPONSE,
-                    user_message="O sistema de IA retornou uma resposta inválida. Tente descrever o treino de forma mais clara.",
-                )
-
-            # Validar estrutura básica
-            if not isinstance(parsed_data, dict):
-                raise LLMParsingError(
-                    message="Resposta do LLM deve ser um objeto JSON",
-                    details=f"Recebido: {type(parsed_data)}",
-                    model=self.model,
-                    response=content,
-                    error_code=ErrorCode.LLM_INVALID_RESPONSE,
-                    user_message="O sistema de IA retornou dados em formato incorreto. Tente novamente.",
-                )
-
-            logger.info("Groq API parseou com sucesso!")
-            
-            # Validate the parsed workout data
-            validation_result = validate_workout_data(parsed_data)
-            
-            if not validation_result["is_valid"]:
-                # Generate user-friendly error message
-                error_message = get_user_friendly_error_message(validation_result["errors"])
-                
-                logger.warning(f"Validação falhou: {len(validation_result['errors'])} erros encontrados")
-                
-                # Raise ValidationError with user-friendly message
-                raise ValidationError(
-                    message="Dados incompletos no treino parseado",
-                    field="workout_data",
-                    value=None,  # Don't include full data in error for privacy
-                    error_code=ErrorCode.MISSING_REQUIRED_FIELD,
-                    user_message=error_message
-                )
-            
-            logger.info("Dados do treino validados com sucesso!")
-            return parsed_data
-
-        except (ValidationError, LLMParsingError):
-            # Re-raise custom exceptions
-            raise
-        except Exception as e:
-            error_str = str(e).lower()
-
-            # Check for rate limit errors (HTTP 429 or rate_limit in message)
-            is_rate_limit = (
-                "rate_limit" in error_str or
-                "429" in error_str or
-                "too many requests" in error_str or
-                (hasattr(e, "status_code") and e.status_code == 429)
-            )
-
-            if is_rate_limit:
-                raise ServiceUnavailableError(
-                    message="Limite de taxa do Groq API excedido",
-                    details="Tente novamente em alguns segundos",
-                    service="Groq API",
-                    error_code=ErrorCode.LLM_RATE_LIMIT_EXCEEDED,
-                    user_message="Muitas solicitações ao sistema de IA. Aguarde alguns segundos e tente novamente.",
-                    retry_after=30,
-                    cause=e,
-                )
-
-            # Check for authentication errors (HTTP 401)
-            is_auth_error = (
-                "unauthorized" in error_str or
-                "401" in error_str or
-                ("invalid" in error_str and "key" in error_str) or
-                (hasattr(e, "status_code") and e.status_code == 401)
-            )
-
-            if is_auth_error:
-                raise ServiceUnavailableError(
-                    message="Chave API Groq inválida",
-                    details="Verifique a configuração GROQ_API_KEY",
-                    service="Groq API",
-                    error_code=ErrorCode.GROQ_API_ERROR,
-                    user_message="Erro de autenticação com o sistema de IA. Contate o administrador.",
-                    cause=e,
-                )
-
-            # Check for timeout errors
-            is_timeout = (
-                "timeout" in error_str or
-                "timed out" in error_str or
-                (hasattr(e, "status_code") and e.status_code == 504)
-            )
-
-            if is_timeout:
-                raise ServiceUnavailableError(
-                    message="Timeout na conexão com Groq API",
-                    details=str(e),
-                    service="Groq API",
-                    error_code=ErrorCode.LLM_TIMEOUT,
-                    user_message="O sistema de IA demorou muito para responder. Tente novamente.",
-                    cause=e,
-                )
-
-            # Generic error
-            logger.exception("Erro inesperado no LLM parsing")
-            raise LLMParsingError(
-                message="Erro inesperado no parsing",
-                details=f"Erro interno: {e!s}",
-                model=self.model,
-                error_code=ErrorCode.LLM_PARSING_FAILED,
-                user_message="Erro inesperado no sistema de IA. Tente novamente.",
-                cause=e,
-            )
-
-    def _build_prompt(self, transcription: str) -> str:
-        """Constrói o prompt para o LLM"""
-        return f"""Você é um assistente especializado em fitness brasileiro. Extraia informações do seguinte treino:
-
-"{transcription}"
+# Partes estáticas do prompt, montadas uma única vez na importação. Todas as
+# instruções vêm antes da transcrição para que o prefixo seja idêntico entre
+# requisições e possa ser reaproveitado pelo cache de prompt do provedor.
+_PROMPT_PREFIX = """Você é um assistente especializado em fitness brasileiro. Extraia informações do treino transcrito ao final desta mensagem.
 
 IMPORTANTE sobre NOMES DE EXERCÍCIOS:
 - Preserve SEMPRE as variações e qualificadores: "supino reto", "supino inclinado", "supino declinado"
@@ -266,17 +83,12 @@ EXEMPLOS DE NOMES CORRETOS:
 - "agachamento livre com barra" (livre = não é smith)
 - "leg press 45 graus" (já específico)
 
-
-
 REGRAS DE NOMENCLATURA:
 1. Se mencionou "com barra", "com halteres", etc → mantenha no nome
 2. Se NÃO mencionou equipamento:
    - Exercícios com barra livre (supino, agachamento, terra) → assume "com barra"
    - Exercícios em máquina (leg press, cadeira, polia) → use nome da máquina
    - Exercícios com halteres típicos (rosca alternada, elevação) → "com halteres"
-3. Para rosca: se não especificou, assume "rosca direta"
-4. Para supino: se não especificou, assume "supino reto com barra"
-5. Para agachamento: se não especificou, assume "agachamento livre com barra"
 
 INFERÊNCIAS DE EQUIPAMENTO por padrão:
 - "supino" sem especificar → "supino reto com barra"
@@ -299,37 +111,24 @@ IMPORTANTE sobre EXERCÍCIOS ISOMÉTRICOS (prancha, ponte, etc):
 IMPORTANTE sobre PESOS:
 - Se mencionou DIFERENTES pesos para cada série, use um array: "weights_kg": [10, 15, 20]
 - Se mencionou MESMO peso para todas as séries, repita no array: "weights_kg": [60, 60, 60]
-- O tamanho do array weights_kg DEVE ser igual ao número de séries
-- Para exercícios isométricos (prancha, ponte, etc), use pesos zero: [0, 0, 0]
 
 EXEMPLOS DE PARSING DE PESOS:
 
 Exemplo 1 - Pesos diferentes (pirâmide crescente):
 Entrada: "3 séries de 12, 10, 8 com 10, 15 e 20 kg"
-Saída: {{"sets": 3, "reps": [12, 10, 8], "weights_kg": [10, 15, 20]}}
+Saída: {"sets": 3, "reps": [12, 10, 8], "weights_kg": [10, 15, 20]}
 
 Exemplo 2 - Pesos diferentes (pirâmide decrescente):
 Entrada: "4 séries de 8, 10, 12, 12 com 80, 70, 60, 60 kg"
-Saída: {{"sets": 4, "reps": [8, 10, 12, 12], "weights_kg": [80, 70, 60, 60]}}
+Saída: {"sets": 4, "reps": [8, 10, 12, 12], "weights_kg": [80, 70, 60, 60]}
 
 Exemplo 3 - Mesmo peso para todas:
 Entrada: "3 séries de 12 com 60 kg"
-Saída: {{"sets": 3, "reps": [12, 12, 12], "weights_kg": [60, 60, 60]}}
+Saída: {"sets": 3, "reps": [12, 12, 12], "weights_kg": [60, 60, 60]}
 
 Exemplo 4 - Dropset:
 Entrada: "3 séries de 10 repetições, primeira com 50kg, segunda com 40kg, terceira com 30kg"
-Saída: {{"sets": 3, "reps": [10, 10, 10], "weights_kg": [50, 40, 30]}}
-
-EXEMPLOS CORRETOS:
-❌ ERRADO: {{"name": "supino"}} (muito genérico!)
-✅ CERTO: {{"name": "supino reto"}} (específico)
-
-❌ ERRADO: {{"name": "rosca"}} (qual rosca?)
-✅ CERTO: {{"name": "rosca direta"}} (específica)
-
-❌ ERRADO: {{"name": "leg press"}} (qual variação?)
-✅ CERTO: {{"name": "leg press 45 graus"}} (específico)
-
+Saída: {"sets": 3, "reps": [10, 10, 10], "weights_kg": [50, 40, 30]}
 
 IMPORTANTE sobre DESCANSO:
 - Extraia tempo de descanso entre séries se mencionado
@@ -354,77 +153,77 @@ EXEMPLOS DE PARSING:
 
 Exemplo 1 - Completo com descanso e dificuldade:
 Entrada: "Supino reto 3 séries de 12, 10, 8 com 40, 50, 60 kg, 1 minuto de descanso, estava bem pesado"
-Saída: {{
+Saída: {
   "name": "supino reto",
   "sets": 3,
   "reps": [12, 10, 8],
   "weights_kg": [40, 50, 60],
   "rest_seconds": 60,
   "perceived_difficulty": 8
-}}
+}
 
 Exemplo 2 - Com descanso diferente:
 Entrada: "Agachamento 4x10 com 100kg, descansando 2 minutos, bem puxado"
-Saída: {{
+Saída: {
   "name": "agachamento livre",
   "sets": 4,
   "reps": [10, 10, 10, 10],
   "weights_kg": [100, 100, 100, 100],
   "rest_seconds": 120,
   "perceived_difficulty": 8
-}}
+}
 
 Exemplo 3 - Fácil:
 Entrada: "Rosca direta 3x15 com 10kg, 45 segundos de intervalo, estava bem leve"
-Saída: {{
+Saída: {
   "name": "rosca direta",
   "sets": 3,
   "reps": [15, 15, 15],
   "weights_kg": [10, 10, 10],
   "rest_seconds": 45,
   "perceived_difficulty": 3
-}}
+}
 
 Exemplo 4 - Sem descanso/dificuldade mencionados:
 Entrada: "Leg press 3x12 com 150kg"
-Saída: {{
+Saída: {
   "name": "leg press 45 graus",
   "sets": 3,
   "reps": [12, 12, 12],
   "weights_kg": [150, 150, 150],
   "rest_seconds": null,
   "perceived_difficulty": null
-}}
+}
 
 Exemplo 5 - À falha muscular:
 Entrada: "Desenvolvimento 3 séries de 10, 8, 6 com 30kg, indo até a falha, bem difícil"
-Saída: {{
+Saída: {
   "name": "desenvolvimento",
   "sets": 3,
   "reps": [10, 8, 6],
   "weights_kg": [30, 30, 30],
   "rest_seconds": null,
   "perceived_difficulty": 9
-}}
+}
 
-{{
+{
   "body_weight_kg": float ou null,
   "energy_level": int de 1-10 ou null,
   "start_time": "HH:MM" ou null,
   "end_time": "HH:MM" ou null,
   "resistance_exercises": [
-    {{
+    {
       "name": "nome COMPLETO e ESPECÍFICO com equipamento em minúsculas",
       "sets": número de séries,
       "reps": [array com repetições de cada série],
-      "weight_kg": [array com peso de cada série - obrigatório]
+      "weights_kg": [array com peso de cada série - obrigatório],
       "rest_seconds": tempo de descanso em segundos ou null,
       "perceived_difficulty": RPE de 1-10 ou null,
       "notes": null
-    }}
+    }
   ],
   "aerobic_exercises": [
-    {{
+    {
       "name": "nome do exercício em minúsculas",
       "duration_minutes": duração,
       "distance_km": distância ou null,
@@ -432,51 +231,50 @@ Saída: {{
       "calories_burned": calorias queimadas ou null,
       "intensity_level": "low|moderate|high|hiit",
       "notes": null
-    }}
+    }
   ],
   "notes": null
-}}
-
+}
 
 EXEMPLOS COMPLETOS:
 
 Entrada: "Fiz 3 séries de supino com 60kg"
-Saída: {{"name": "supino reto com barra", "sets": 3, "reps": [3,3,3], "weights_kg": [60,60,60]}}
+Saída: {"name": "supino reto com barra", "sets": 3, "reps": [3,3,3], "weights_kg": [60,60,60]}
 
 Entrada: "Rosca alternada 3x12 com 12kg"
-Saída: {{"name": "rosca alternada com halteres", "sets": 3, "reps": [12,12,12], "weights_kg": [12,12,12]}}
+Saída: {"name": "rosca alternada com halteres", "sets": 3, "reps": [12,12,12], "weights_kg": [12,12,12]}
 
 Entrada: "Leg press 4 séries de 15 com 200kg"
-Saída: {{"name": "leg press 45 graus", "sets": 4, "reps": [15,15,15,15], "weights_kg": [200,200,200,200]}}
+Saída: {"name": "leg press 45 graus", "sets": 4, "reps": [15,15,15,15], "weights_kg": [200,200,200,200]}
 
 Entrada: "Tríceps na polia 3x15"
-Saída: {{"name": "tríceps na polia com corda", "sets": 3, "reps": [15,15,15]}}
+Saída: {"name": "tríceps na polia com corda", "sets": 3, "reps": [15,15,15]}
 
 Entrada: "Prancha abdominal 3 séries de 60, 45, 30 segundos"
-Saída: {{"name": "prancha abdominal", "sets": 3, "reps": [60,45,30], "weights_kg": [0,0,0]}}
+Saída: {"name": "prancha abdominal", "sets": 3, "reps": [60,45,30], "weights_kg": [0,0,0]}
 
 Entrada: "Fiz prancha 4x45 segundos"
-Saída: {{"name": "prancha abdominal", "sets": 4, "reps": [45,45,45,45], "weights_kg": [0,0,0,0]}}
+Saída: {"name": "prancha abdominal", "sets": 4, "reps": [45,45,45,45], "weights_kg": [0,0,0,0]}
 
 Entrada: "Prancha com 20kg nas costas, 3 séries de 30 segundos"
-Saída: {{"name": "prancha abdominal", "sets": 3, "reps": [30,30,30], "weights_kg": [20,20,20]}}
+Saída: {"name": "prancha abdominal", "sets": 3, "reps": [30,30,30], "weights_kg": [20,20,20]}
 
 EXEMPLOS DE EXERCÍCIOS AERÓBICOS:
 
 Entrada: "Corri 30 minutos na esteira"
-Saída: {{"name": "corrida na esteira", "duration_minutes": 30, "distance_km": null, "average_heart_rate": null, "calories_burned": null, "intensity_level": "moderate"}}
+Saída: {"name": "corrida na esteira", "duration_minutes": 30, "distance_km": null, "average_heart_rate": null, "calories_burned": null, "intensity_level": "moderate"}
 
 Entrada: "Fiz 45 minutos de bicicleta, queimei 350 calorias"
-Saída: {{"name": "bicicleta ergométrica", "duration_minutes": 45, "distance_km": null, "average_heart_rate": null, "calories_burned": 350, "intensity_level": "moderate"}}
+Saída: {"name": "bicicleta ergométrica", "duration_minutes": 45, "distance_km": null, "average_heart_rate": null, "calories_burned": 350, "intensity_level": "moderate"}
 
 Entrada: "Caminhei 5km em 1 hora, frequência cardíaca média de 140 bpm"
-Saída: {{"name": "caminhada", "duration_minutes": 60, "distance_km": 5, "average_heart_rate": 140, "calories_burned": null, "intensity_level": "moderate"}}
+Saída: {"name": "caminhada", "duration_minutes": 60, "distance_km": 5, "average_heart_rate": 140, "calories_burned": null, "intensity_level": "moderate"}
 
 Entrada: "Spinning 30 minutos, FC média 165, queimei 280 calorias"
-Saída: {{"name": "spinning", "duration_minutes": 30, "distance_km": null, "average_heart_rate": 165, "calories_burned": 280, "intensity_level": "high"}}
+Saída: {"name": "spinning", "duration_minutes": 30, "distance_km": null, "average_heart_rate": 165, "calories_burned": 280, "intensity_level": "high"}
 
 Entrada: "Natação 20 minutos intenso"
-Saída: {{"name": "natação", "duration_minutes": 20, "distance_km": null, "average_heart_rate": null, "calories_burned": null, "intensity_level": "high"}}
+Saída: {"name": "natação", "duration_minutes": 20, "distance_km": null, "average_heart_rate": null, "calories_burned": null, "intensity_level": "high"}
 
 IMPORTANTE sobre EXERCÍCIOS AERÓBICOS:
 - Se mencionou "calorias", "kcal", "cal" → extrair para "calories_burned"
@@ -488,14 +286,299 @@ IMPORTANTE sobre EXERCÍCIOS AERÓBICOS:
 
  SEMPRE use "weights_kg" como array (nunca "weight_kg" singular)
 - O array weights_kg DEVE ter o mesmo tamanho que o número de séries
-- Se não especificar variação e for supino, assuma "supino reto"
-- Se não especificar variação e for agachamento, assuma "agachamento livre"
-- "3 séries de 12, 10, 8" → {{"sets": 3, "reps": [12, 10, 8]}}
-- "4x15" → {{"sets": 4, "reps": [15, 15, 15, 15]}}
 - Se campo não mencionado, use null
 - Não invente dados
 
-Retorne APENAS o JSON, sem texto adicional."""
+Retorne APENAS um objeto JSON válido, sem texto adicional.
+
+TREINO:
+\""""
+
+_PROMPT_SUFFIX = '"'
+
+
+class LLMParsingService:
+    """Serviço para parsear transcrições usando Groq API"""
+
+    def __init__(self) -> None:
+
+        logger.info("Inicializando Groq LLM...")
+
+        if not settings.GROQ_API_KEY:
+            raise ServiceUnavailableError(
+                "GROQ_API_KEY não configurada",
+                "Configure a variável de ambiente GROQ_API_KEY",
+                error_code=ErrorCode.GROQ_API_ERROR,
+            )
+
+        try:
+            self._api_key = settings.GROQ_API_KEY
+            self._max_retries = settings.LLM_MAX_RETRIES
+            self._client: Optional[AsyncGroq] = None
+            _get_groq_client(self._api_key, self._max_retries)
+            self.model = settings.LLM_MODEL
+            # Cache de respostas já parseadas (transcrições repetidas, reenvios)
+            self._parse_cache: TTLCache = TTLCache(
+                maxsize=settings.LLM_CACHE_MAX_ENTRIES,
+                ttl=settings.LLM_CACHE_TTL_SECONDS,
+            )
+            # Limita chamadas simultâneas e por minuto para não estourar a cota do Groq
+            self._semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+            self._limiter = AsyncLimiter(settings.LLM_REQUESTS_PER_MINUTE, 60)
+            self._inflight: Dict[str, asyncio.Future] = {}
+            logger.info("LLM Service inicializado: %s (Async Groq API)", self.model)
+        except Exception as e:
+            raise ServiceUnavailableError(
+                "Falha ao inicializar cliente Groq LLM",
+                f"Erro: {e!s}",
+                error_code=ErrorCode.GROQ_API_ERROR,
+            )
+
+    @property
+    def client(self) -> AsyncGroq:
+        """Cliente Groq usado nas requisições
+
+        O cliente compartilhado é resolvido a cada uso: depois que uma instância
+        o fecha (close), as demais passam a usar um novo em vez do fechado.
+        """
+        if self._client is not None:
+            return self._client
+        return _get_groq_client(self._api_key, self._max_retries)
+
+    @client.setter
+    def client(self, client: AsyncGroq) -> None:
+        """Usa um cliente específico em vez do compartilhado"""
+        self._client = client
+
+    async def close(self) -> None:
+        """Fecha o cliente Groq compartilhado e libera o pool de conexões HTTP"""
+        client = self.client
+        if not client.is_closed():
+            await client.close()
+            logger.info("Cliente Groq LLM fechado")
+
+    async def parse_workout(self, transcription: str) -> Dict[str, Any]:
+        """Parse uma transcrição de treino usando Groq API
+        
+        Args:
+            transcription: Texto transcrito do áudio
+            
+        Returns:
+            Dict com dados estruturados do treino
+            
+        Raises:
+            ValidationError: Se a transcrição é inválida
+            LLMParsingError: Se o parsing falhar
+            ServiceUnavailableError: Se o serviço Groq estiver indisponível
+
+        """
+        stripped = transcription.strip() if transcription else ""
+        if not stripped:
+            raise ValidationError(
+                message="Transcrição vazia ou inválida",
+                field="transcription",
+                value=transcription,
+                error_code=ErrorCode.MISSING_REQUIRED_FIELD,
+                user_message="Por favor, envie um áudio com conteúdo válido",
+            )
+
+        if len(stripped) > settings.MAX_TRANSCRIPTION_LENGTH:
+            raise ValidationError(
+                message=f"Transcrição muito longa (máximo {settings.MAX_TRANSCRIPTION_LENGTH:,} caracteres)",
+                field="transcription",
+                value=len(stripped),
+                error_code=ErrorCode.VALUE_OUT_OF_RANGE,
+                user_message=f"Áudio muito longo. Máximo permitido: {settings.MAX_TRANSCRIPTION_LENGTH:,} caracteres",
+            )
+
+        cache_key = self._cache_key(stripped)
+        cached = self._parse_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Transcrição já parseada, usando resultado em cache")
+            # Cópia para que quem chamou não altere o resultado em cache
+            return copy.deepcopy(cached)
+
+        # Chamadas simultâneas com a mesma transcrição aguardam a mesma requisição
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._request_parse(stripped, cache_key))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda done: self._finish_inflight(cache_key, done))
+        else:
+            logger.info("Transcrição idêntica já em processamento, aguardando resultado")
+
+        # shield: cancelar um chamador não cancela a requisição dos demais
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def _finish_inflight(self, cache_key: str, task: asyncio.Future) -> None:
+        """Remove a requisição concluída e recupera sua exceção
+
+        Se todos os chamadores foram cancelados ninguém aguarda a tarefa; sem
+        recuperar a exceção aqui o asyncio registraria "Task exception was
+        never retrieved". Quem ainda aguarda continua recebendo o erro.
+        """
+        self._inflight.pop(cache_key, None)
+        if not task.cancelled():
+            task.exception()
+
+    async def _request_parse(self, transcription: str, cache_key: str) -> Dict[str, Any]:
+        """Envia a transcrição ao Groq, valida a resposta e guarda no cache"""
+        prompt = self._build_prompt(transcription)
+
+        logger.info("Enviando transcrição para Groq API (%s)...", self.model)
+
+        try:
+            async with self._semaphore, self._limiter:
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[{
+                        "role": "user",
+                        "content": prompt,
+                    }],
+                    temperature=settings.LLM_TEMPERATURE,
+                    max_completion_tokens=settings.LLM_MAX_TOKENS,
+                    # Modo JSON: o Groq só devolve um objeto JSON válido. Não é
+                    # compatível com stream=True, e a validação precisa do objeto
+                    # completo, então a resposta é recebida de uma vez.
+                    response_format={"type": "json_object"},
+                )
+
+            try:
+                content = response.choices[0].message.content
+            except (IndexError, AttributeError):
+                # Sem choices ou sem message na resposta
+                raise LLMParsingError(
+                    message="Resposta vazia do LLM",
+                    details="O modelo não retornou uma resposta válida",
+                    model=self.model,
+                    error_code=ErrorCode.LLM_INVALID_RESPONSE,
+                    user_message="O sistema de IA não conseguiu processar o áudio. Tente novamente.",
+                )
+
+            if not content:
+                raise LLMParsingError(
+                    message="Conteúdo vazio na resposta do LLM",
+                    details="O modelo retornou uma resposta vazia",
+                    model=self.model,
+                    error_code=ErrorCode.LLM_INVALID_RESPONSE,
+                    user_message="O sistema de IA retornou uma resposta vazia. Tente novamente.",
+                )
+
+            # Limpar markdown se presente (modelos sem suporte ao modo JSON)
+            content = content.strip().removeprefix("```json").removeprefix("```").removesuffix("```").strip()
+
+            # Parsear JSON
+            try:
+                parsed_data = orjson.loads(content)
+            except orjson.JSONDecodeError as e:
+                logger.error("Erro ao parsear JSON: %s", e)
+                logger.error("Resposta do Groq: %.500s...", content)
+                raise LLMParsingError(
+                    message="Resposta do LLM não é JSON válido",
+                    details=f"Erro de parsing: {e!s}",
+                    model=self.model,
+                    response=content,
+                    error_code=ErrorCode.LLM_INVALID_RESPONSE,
+                    user_message="O sistema de IA retornou uma resposta inválida. Tente descrever o treino de forma mais clara.",
+                )
+
+            # Validar estrutura básica
+            if not isinstance(parsed_data, dict):
+                raise LLMParsingError(
+                    message="Resposta do LLM deve ser um objeto JSON",
+                    details=f"Recebido: {type(parsed_data)}",
+                    model=self.model,
+                    response=content,
+                    error_code=ErrorCode.LLM_INVALID_RESPONSE,
+                    user_message="O sistema de IA retornou dados em formato incorreto. Tente novamente.",
+                )
+
+            logger.info("Groq API parseou com sucesso!")
+            
+            # Validate the parsed workout data
+            validation_result = validate_workout_data(parsed_data)
+            
+            if not validation_result["is_valid"]:
+                # Generate user-friendly error message
+                error_message = get_user_friendly_error_message(validation_result["errors"])
+                
+                logger.warning("Validação falhou: %d erros encontrados", len(validation_result["errors"]))
+                
+                # Raise ValidationError with user-friendly message
+                raise ValidationError(
+                    message="Dados incompletos no treino parseado",
+                    field="workout_data",
+                    value=None,  # Don't include full data in error for privacy
+                    error_code=ErrorCode.MISSING_REQUIRED_FIELD,
+                    user_message=error_message
+                )
+            
+            logger.info("Dados do treino validados com sucesso!")
+            if self._parse_cache.maxsize:
+                self._parse_cache[cache_key] = parsed_data
+            return parsed_data
+
+        except (ValidationError, LLMParsingError):
+            # Re-raise custom exceptions
+            raise
+        except Exception as e:
+            # Rate limit (HTTP 429), já após as tentativas automáticas do SDK
+            if isinstance(e, RateLimitError):
+                raise ServiceUnavailableError(
+                    message="Limite de taxa do Groq API excedido",
+                    details="Tente novamente em alguns segundos",
+                    service="Groq API",
+                    error_code=ErrorCode.LLM_RATE_LIMIT_EXCEEDED,
+                    user_message="Muitas solicitações ao sistema de IA. Aguarde alguns segundos e tente novamente.",
+                    retry_after=30,
+                    cause=e,
+                )
+
+            # Chave inválida (HTTP 401)
+            if isinstance(e, AuthenticationError):
+                raise ServiceUnavailableError(
+                    message="Chave API Groq inválida",
+                    details="Verifique a configuração GROQ_API_KEY",
+                    service="Groq API",
+                    error_code=ErrorCode.GROQ_API_ERROR,
+                    user_message="Erro de autenticação com o sistema de IA. Contate o administrador.",
+                    cause=e,
+                )
+
+            # Timeout do cliente HTTP ou do gateway (HTTP 504)
+            if isinstance(e, (APITimeoutError, TimeoutError)) or (
+                isinstance(e, APIStatusError) and e.status_code == 504
+            ):
+                raise ServiceUnavailableError(
+                    message="Timeout na conexão com Groq API",
+                    details=str(e),
+                    service="Groq API",
+                    error_code=ErrorCode.LLM_TIMEOUT,
+                    user_message="O sistema de IA demorou muito para responder. Tente novamente.",
+                    cause=e,
+                )
+
+            # Generic error
+            logger.exception("Erro inesperado no LLM parsing")
+            raise LLMParsingError(
+                message="Erro inesperado no parsing",
+                details=f"Erro interno: {e!s}",
+                model=self.model,
+                error_code=ErrorCode.LLM_PARSING_FAILED,
+                user_message="Erro inesperado no sistema de IA. Tente novamente.",
+                cause=e,
+            )
+
+    def _cache_key(self, transcription: str) -> str:
+        """Chave do cache: modelo + transcrição normalizada (caixa e espaços)"""
+        normalized = _WHITESPACE_RE.sub(" ", transcription.strip().lower())
+        return hashlib.sha256(f"{self.model}\0{normalized}".encode()).hexdigest()
+
+    def _build_prompt(self, transcription: str) -> str:
+        """Constrói o prompt para o LLM"""
+        # Uma única alocação, sem a string intermediária de prefixo + transcrição
+        return "".join((_PROMPT_PREFIX, transcription, _PROMPT_SUFFIX))
+
 
 # Service instantiation moved to container.py
 # This module only defines the service class
@@ -4,13 +4,14 @@ import asyncio
 from datetime import datetime, timedelta
 from typing import Optional, Tuple, Union
 
-from sqlalchemy import func, select, update
+from sqlalchemy import func, insert, literal, select, update
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from config.logging_config import get_logger
 from config.settings import settings
 from database.async_connection import get_async_session_context
-from database.models import SessionStatus, WorkoutSession
+from database.models import SessionAudio, SessionStatus, WorkoutSession
 from services.exceptions import DatabaseError, ErrorCode, ValidationError
 
 logger = get_logger(__name__)
@@ -22,6 +23,9 @@ class AsyncSessionManager:
     def __init__(self):
         self._user_locks = {}
         self._lock_creation_lock = asyncio.Lock()
+        # Latest session ID handed out per user; only a hint, it is re-checked
+        # (by primary key) on every use since sessions are finished elsewhere
+        self._active_sessions: dict[str, int] = {}
 
     async def _get_user_lock(self, user_id: str) -> asyncio.Lock:
         if user_id not in self._user_locks:
@@ -59,9 +63,6 @@ class AsyncSessionManager:
                 user_message="User ID cannot be empty",
             )
 
-        # Clean up stale sessions before checking for active ones
-        await self.cleanup_stale_sessions()
-
         user_lock = await self._get_user_lock(normalized_user_id)
 
         async with user_lock:
@@ -70,41 +71,63 @@ class AsyncSessionManager:
                 now = datetime.now()
                 timeout_threshold = now - timedelta(hours=settings.SESSION_TIMEOUT_HOURS)
 
-                # Find the most recent session for this user
-                stmt = (
-                    select(WorkoutSession)
-                    .where(WorkoutSession.user_id == normalized_user_id)
-                    .order_by(WorkoutSession.date.desc(), WorkoutSession.start_time.desc())
-                    .limit(1)
-                )
-                result = await session.execute(stmt)
-                last_session = result.scalar_one_or_none()
+                # Clean up stale sessions in this same transaction before
+                # checking for active ones
+                cleaned_count = await self._finish_stale_sessions(session, timeout_threshold)
+
+                # The cached session is fetched by primary key; the sorted
+                # lookup is only needed when it is gone or no longer active
+                last_session = None
+                cached_session_id = self._active_sessions.get(normalized_user_id)
+                if cached_session_id is not None:
+                    last_session = await session.get(WorkoutSession, cached_session_id)
+                if last_session is None or not self._is_session_active(last_session, timeout_threshold):
+                    last_session = await self._get_latest_session(session, normalized_user_id)
 
                 # Check if we can reuse the last session
                 if last_session and self._is_session_active(last_session, timeout_threshold):
+                    if cleaned_count:
+                        await session.commit()
+                    self._active_sessions[normalized_user_id] = last_session.session_id
                     logger.info(
-                        f"Reusing active session {last_session.session_id} for user {normalized_user_id}"
+                        "Reusing active session %s for user %s", last_session.session_id, normalized_user_id
                     )
                     return last_session, False
 
-                # Create new session
+                # Create new session; the timestamps reuse `now` instead of
+                # their datetime.now column defaults so they all agree
                 new_session = WorkoutSession(
                     user_id=normalized_user_id,
                     date=now.date(),
                     start_time=now.time(),
+                    created_at=now,
+                    last_update=now,
                     status=SessionStatus.ATIVA,
                     audio_count=0,
                 )
 
+                # All column defaults are client-side and the key comes back from
+                # the INSERT, so no refresh round-trip is needed after commit
                 session.add(new_session)
                 await session.commit()
-                await session.refresh(new_session)
+                self._active_sessions[normalized_user_id] = new_session.session_id
 
                 logger.info(
-                    f"Created new session {new_session.session_id} for user {normalized_user_id}"
+                    "Created new session %s for user %s", new_session.session_id, normalized_user_id
                 )
                 return new_session, True
 
+    async def _get_latest_session(self, session: AsyncSession, user_id: str) -> Optional[WorkoutSession]:
+        """Find the most recent session for a user"""
+        stmt = (
+            select(WorkoutSession)
+            .where(WorkoutSession.user_id == user_id)
+            .order_by(WorkoutSession.date.desc(), WorkoutSession.start_time.desc())
+            .limit(1)
+        )
+        result = await session.execute(stmt)
+        return result.scalar_one_or_none()
+
     def _is_session_active(self, session: WorkoutSession, timeout_threshold: datetime) -> bool:
         """Check if a session is still active based on timeout"""
         if session.status == SessionStatus.FINALIZADA:
@@ -123,6 +146,9 @@ class AsyncSessionManager:
     ) -> bool:
         """Update session metadata efficiently (async)
         
+        The transcription replaces original_transcription and is appended to
+        the session's SessionAudio history as a single-row INSERT.
+        
         Args:
             session_id: Session ID
             transcription: Latest transcription text
@@ -169,11 +195,26 @@ class AsyncSessionManager:
                     .values(**update_values)
                 )
                 result = await session.execute(stmt)
-                await session.commit()
 
                 success = result.rowcount > 0
+                if success and transcription:
+                    # audio_count was already incremented for this audio, so
+                    # it doubles as the audio number without reading the row
+                    await session.execute(
+                        insert(SessionAudio).from_select(
+                            ["session_id", "audio_number", "transcription"],
+                            select(
+                                WorkoutSession.session_id,
+                                func.coalesce(WorkoutSession.audio_count, 0),
+                                literal(transcription),
+                            ).where(WorkoutSession.session_id == session_id),
+                        ),
+                    )
+
+                await session.commit()
+
                 if success:
-                    logger.debug(f"Updated metadata for session {session_id}")
+                    logger.debug("Updated metadata for session %s", session_id)
 
                 return success
 
@@ -216,56 +257,57 @@ class AsyncSessionManager:
             logger.exception("Error counting active sessions")
             return 0  # Return 0 on error rather than raising
 
-    async def cleanup_stale_sessions(self) -> int:
-        """Mark stale sessions as finished (async)
+    async def _finish_stale_sessions(self, session: AsyncSession, timeout_threshold: datetime) -> int:
+        """Mark stale sessions as finished in the caller's transaction
         
-        Returns:
-            Number of sessions cleaned up
-
+        The caller commits; returns the number of sessions changed.
         """
-        try:
-            async with get_async_session_context() as session:
-                now = datetime.now()
-                timeout_threshold = now - timedelta(hours=settings.SESSION_TIMEOUT_HOURS)
+        # First, find stale sessions to calculate their durations
+        find_stmt = (
+            select(WorkoutSession)
+            .where(
+                (WorkoutSession.status == SessionStatus.ATIVA) &
+                (WorkoutSession.last_update < timeout_threshold),
+            )
+        )
 
-                # First, find stale sessions to calculate their durations
-                find_stmt = (
-                    select(WorkoutSession)
-                    .where(
-                        (WorkoutSession.status == SessionStatus.ATIVA) &
-                        (WorkoutSession.last_update < timeout_threshold),
-                    )
-                )
+        result = await session.execute(find_stmt)
+        stale_sessions = result.scalars().all()
 
-                result = await session.execute(find_stmt)
-                stale_sessions = result.scalars().all()
+        # Update each session with calculated duration
+        for stale_session in stale_sessions:
+            # Calculate duration from start_time to timeout_threshold
+            start_datetime = datetime.combine(stale_session.date, stale_session.start_time)
+            # Use timeout_threshold as end time (when session should have ended)
+            duration_minutes = int((timeout_threshold - start_datetime).total_seconds() // 60)
 
-                if not stale_sessions:
-                    return 0
+            # Ensure duration is not negative
+            duration_minutes = max(0, duration_minutes)
 
-                # Update each session with calculated duration
-                cleaned_count = 0
-                for stale_session in stale_sessions:
-                    # Calculate duration from start_time to timeout_threshold
-                    start_datetime = datetime.combine(stale_session.date, stale_session.start_time)
-                    # Use timeout_threshold as end time (when session should have ended)
-                    duration_minutes = int((timeout_threshold - start_datetime).total_seconds() // 60)
+            # Update the session
+            stale_session.status = SessionStatus.FINALIZADA
+            stale_session.end_time = timeout_threshold.time()
+            stale_session.duration_minutes = duration_minutes
 
-                    # Ensure duration is not negative
-                    duration_minutes = max(0, duration_minutes)
+        if stale_sessions:
+            logger.info(f"Cleaned up {len(stale_sessions)} stale sessions")
 
-                    # Update the session
-                    stale_session.status = SessionStatus.FINALIZADA
-                    stale_session.end_time = timeout_threshold.time()
-                    stale_session.duration_minutes = duration_minutes
+        return len(stale_sessions)
 
-                    session.add(stale_session)
-                    cleaned_count += 1
+    async def cleanup_stale_sessions(self) -> int:
+        """Mark stale sessions as finished (async)
+        
+        Returns:
+            Number of sessions cleaned up
 
-                await session.commit()
+        """
+        try:
+            async with get_async_session_context() as session:
+                timeout_threshold = datetime.now() - timedelta(hours=settings.SESSION_TIMEOUT_HOURS)
 
-                if cleaned_count > 0:
-                    logger.info(f"Cleaned up {cleaned_count} stale sessions")
+                cleaned_count = await self._finish_stale_sessions(session, timeout_threshold)
+                if cleaned_count:
+                    await session.commit()
 
                 return cleaned_count
 
@@ -1,10 +1,13 @@
 """Async user service for improved database performance"""
 
-from typing import List, Optional
-from sqlalchemy import select, update, delete
+from typing import List, Optional, Tuple
+
+from cachetools import TTLCache
+from sqlalchemy import select, update, delete, exists
 from sqlalchemy.exc import SQLAlchemyError
 
 from config.logging_config import get_logger
+from config.settings import settings
 from database.async_connection import get_async_session_context
 from database.models import User
 from services.exceptions import DatabaseError, ValidationError, ErrorCode
@@ -15,29 +18,56 @@ logger = get_logger(__name__)
 class AsyncUserService:
     """Async service for managing users with improved performance"""
 
-    async def is_user_authorized(self, user_id: str) -> bool:
-        """Check if a user is authorized to use the bot (async)
+    def __init__(self):
+        # get_auth_state results per user ID, checked on every Telegram update;
+        # entries are dropped whenever this service writes to that user
+        self._auth_cache: TTLCache = TTLCache(
+            maxsize=settings.USER_AUTH_CACHE_MAX_ENTRIES,
+            ttl=settings.USER_AUTH_CACHE_TTL_SECONDS,
+        )
+
+    async def get_auth_state(self, user_id: str) -> Tuple[bool, bool]:
+        """Check authorization and admin status in a single lookup (async)
         
         Args:
             user_id: Telegram user ID
             
         Returns:
-            True if authorized, False otherwise
+            (authorized, admin) tuple; both False for unknown users
+            or if the database lookup fails
         """
+        state = self._auth_cache.get(user_id)
+        if state is not None:
+            return state
+        
         try:
             async with get_async_session_context() as session:
-                stmt = select(User).where(
-                    User.user_id == user_id,
-                    User.is_active == True
-                )
+                stmt = select(User.is_active, User.is_admin).where(User.user_id == user_id)
                 result = await session.execute(stmt)
-                user = result.scalar_one_or_none()
-                return user is not None
+                row = result.first()
                 
         except SQLAlchemyError as e:
             logger.exception("Error checking user authorization")
-            # Deny access on database error for security
-            return False
+            # Deny access on database error for security (and don't cache it)
+            return False, False
+        
+        authorized = bool(row and row.is_active)
+        state = (authorized, authorized and bool(row.is_admin))
+        if self._auth_cache.maxsize:
+            self._auth_cache[user_id] = state
+        return state
+
+    async def is_user_authorized(self, user_id: str) -> bool:
+        """Check if a user is authorized to use the bot (async)
+        
+        Args:
+            user_id: Telegram user ID
+            
+        Returns:
+            True if authorized, False otherwise
+        """
+        authorized, _ = await self.get_auth_state(user_id)
+        return authorized
 
     async def is_user_admin(self, user_id: str) -> bool:
         """Check if a user is an administrator (async)
@@ -48,20 +78,8 @@ class AsyncUserService:
         Returns:
             True if user is admin, False otherwise
         """
-        try:
-            async with get_async_session_context() as session:
-                stmt = select(User).where(
-                    User.user_id == user_id,
-                    User.is_active == True,
-                    User.is_admin == True
-                )
-                result = await session.execute(stmt)
-                user = result.scalar_one_or_none()
-                return user is not None
-                
-        except SQLAlchemyError as e:
-            logger.exception("Error checking admin status")
-            return False
+        _, admin = await self.get_auth_state(user_id)
+        return admin
 
     async def get_user(self, user_id: str) -> Optional[User]:
         """Get user by ID (async)
@@ -128,12 +146,10 @@ class AsyncUserService:
 
         try:
             async with get_async_session_context() as session:
-                # Check if user already exists
-                existing_stmt = select(User).where(User.user_id == user_id)
-                existing_result = await session.execute(existing_stmt)
-                existing_user = existing_result.scalar_one_or_none()
+                # Check if user already exists (EXISTS, no row is loaded)
+                existing_stmt = select(exists().where(User.user_id == user_id))
                 
-                if existing_user:
+                if await session.scalar(existing_stmt):
                     raise ValidationError(
                         message=f"User {user_id} already exists",
                         field="user_id", 
@@ -155,6 +171,7 @@ class AsyncUserService:
                 
                 session.add(new_user)
                 await session.commit()
+                self._auth_cache.pop(user_id, None)
                 await session.refresh(new_user)
                 
                 logger.info(f"User {user_id} added successfully (admin: {is_admin})")
@@ -220,6 +237,7 @@ class AsyncUserService:
                 )
                 result = await session.execute(stmt)
                 await session.commit()
+                self._auth_cache.pop(user_id, None)
                 
                 if result.rowcount == 0:
                     return None
@@ -258,6 +276,7 @@ class AsyncUserService:
                 )
                 result = await session.execute(stmt)
                 await session.commit()
+                self._auth_cache.pop(user_id, None)
                 
                 success = result.rowcount > 0
                 if success:
@@ -359,6 +378,7 @@ class AsyncUserService:
         try:
             async with get_async_session_context() as session:
                 updated_count = 0
+                updated_ids = []
                 
                 for user_update in user_updates:
                     user_id = user_update.pop("user_id", None)
@@ -371,10 +391,13 @@ class AsyncUserService:
                         .values(**user_update)
                     )
                     result = await session.execute(stmt)
+                    updated_ids.append(user_id)
                     if result.rowcount > 0:
                         updated_count += 1
                 
                 await session.commit()
+                for user_id in updated_ids:
+                    self._auth_cache.pop(user_id, None)
                 logger.info(f"Batch updated {updated_count} users")
                 return updated_count
                 
@@ -1,9 +1,10 @@
 """Async workout service for improved database performance"""
 
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List
 
-from sqlalchemy import select
+from sqlalchemy import case, func, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import selectinload
 
@@ -148,17 +149,21 @@ class AsyncWorkoutService:
         parsed_data: Dict[str, Any],
     ) -> None:
         """Update session metadata (async)"""
-        workout_session.audio_count += 1
+        # Counter and notes are updated in SQL, so the UPDATE only carries
+        # this audio's data instead of rewriting the accumulated notes
+        workout_session.audio_count = WorkoutSession.audio_count + 1
 
         # Update optional metadata
         if "energy_level" in parsed_data:
             workout_session.energy_level = parsed_data["energy_level"]
         if "difficulty" in parsed_data:
             workout_session.difficulty = parsed_data["difficulty"]
-        if "notes" in parsed_data:
-            current_notes = workout_session.notes or ""
-            new_notes = parsed_data["notes"]
-            workout_session.notes = f"{current_notes}\n{new_notes}".strip()
+        new_notes = parsed_data.get("notes")
+        if new_notes:
+            workout_session.notes = case(
+                (func.coalesce(WorkoutSession.notes, "") == "", new_notes.strip()),
+                else_=WorkoutSession.notes + "\n" + new_notes.rstrip(),
+            )
 
         session.add(workout_session)
 
@@ -305,26 +310,35 @@ class AsyncWorkoutService:
         """
         try:
             async with get_async_session_context() as session:
-                # Get latest session with related data in single query
+                # Get latest session and its exercise counts in a single query;
+                # the counts are aggregated in SQL instead of loading the rows
+                resistance_count = (
+                    select(func.count(WorkoutExercise.workout_exercise_id))
+                    .where(WorkoutExercise.session_id == WorkoutSession.session_id)
+                    .scalar_subquery()
+                )
+                aerobic_count = (
+                    select(func.count(AerobicExercise.aerobic_id))
+                    .where(AerobicExercise.session_id == WorkoutSession.session_id)
+                    .scalar_subquery()
+                )
                 stmt = (
-                    select(WorkoutSession)
-                    .options(
-                        selectinload(WorkoutSession.exercises),
-                        selectinload(WorkoutSession.aerobics),
-                    )
+                    select(WorkoutSession, resistance_count, aerobic_count)
                     .where(WorkoutSession.user_id == user_id)
                     .order_by(WorkoutSession.date.desc(), WorkoutSession.start_time.desc())
                     .limit(1)
                 )
                 result = await session.execute(stmt)
-                last_session = result.scalar_one_or_none()
+                row = result.one_or_none()
 
-                if not last_session:
+                if not row:
                     return {
                         "has_session": False,
                         "message": "Nenhuma sessão encontrada. Envie um áudio para começar!",
                     }
 
+                last_session, resistance_count, aerobic_count = row
+
                 # Calculate session stats
                 now = datetime.now()
                 time_diff = now - datetime.combine(last_session.date, last_session.start_time)
@@ -337,11 +351,6 @@ class AsyncWorkoutService:
 
                 expired_minutes = minutes_passed - (timeout_hours * 60)
 
-
-                # Count exercises
-                resistance_count = len(last_session.exercises)
-                aerobic_count = len(last_session.aerobics)
-
                 return {
                     "has_session": True,
                     "session": last_session,
@@ -464,6 +473,15 @@ class AsyncWorkoutService:
                 cause=e,
             )
 
+    @staticmethod
+    def _sum_weights_kg(exercises: Iterable[WorkoutExercise]) -> float:
+        """Sum every weight logged for the given exercises
+        
+        Plain sum() on purpose: the per-exercise lists are a handful of sets,
+        too small for array conversion (e.g. NumPy) to pay for itself.
+        """
+        return sum(sum(ex.weights_kg) for ex in exercises if isinstance(ex.weights_kg, list))
+
     def _calculate_session_stats_sync(self, workout_session: WorkoutSession) -> Dict[str, Any]:
         """Calculate session statistics (synchronous, within session context)"""
         resistance_exercises = len(workout_session.exercises)
@@ -471,10 +489,7 @@ class AsyncWorkoutService:
 
         # Calculate resistance stats
         total_sets = sum(ex.sets for ex in workout_session.exercises if ex.sets)
-        total_volume_kg = sum(
-            sum(weights) for ex in workout_session.exercises
-            if ex.weights_kg and isinstance(ex.weights_kg, list) for weights in [ex.weights_kg]
-        )
+        total_volume_kg = self._sum_weights_kg(workout_session.exercises)
 
         # Calculate aerobic stats
         cardio_minutes = sum(
@@ -482,11 +497,12 @@ class AsyncWorkoutService:
             if ex.duration_minutes
         )
 
-        # Get muscle groups (safely access the loaded relationship)
-        muscle_groups = list(set(
-            ex.exercise.muscle_group for ex in workout_session.exercises
-            if ex.exercise and ex.exercise.muscle_group
-        ))
+        # Get muscle groups (safely access the loaded relationship once per exercise),
+        # sorted so the summary message lists them in a stable order
+        muscle_groups = sorted({
+            exercise.muscle_group for ex in workout_session.exercises
+            if (exercise := ex.exercise) and exercise.muscle_group
+        })
 
         return {
             "audio_count": workout_session.audio_count,
@@ -578,10 +594,7 @@ class AsyncWorkoutService:
 
         total_resistance_exercises = len(all_resistance)
         total_sets = sum(ex.sets for ex in all_resistance if ex.sets)
-        total_volume = sum(
-            sum(weights) for ex in all_resistance
-            if ex.weights_kg and isinstance(ex.weights_kg, list) for weights in [ex.weights_kg]
-        )
+        total_volume = self._sum_weights_kg(all_resistance)
 
         # Difficulty levels
         difficulties = [ex.difficulty for s in sessions for ex in s.exercises if hasattr(ex, "difficulty") and ex.difficulty]
@@ -599,10 +612,10 @@ class AsyncWorkoutService:
             is_extrapolated = False
 
         # Muscle group distribution
-        muscle_groups = {}
-        for ex in all_resistance:
-            if ex.exercise and ex.exercise.muscle_group:
-                muscle_groups[ex.exercise.muscle_group] = muscle_groups.get(ex.exercise.muscle_group, 0) + 1
+        muscle_groups = Counter(
+            exercise.muscle_group for ex in all_resistance
+            if (exercise := ex.exercise) and exercise.muscle_group
+        )
 
         total_muscle_exercises = sum(muscle_groups.values())
         muscle_distribution = {
@@ -618,14 +631,8 @@ class AsyncWorkoutService:
         older_sessions = sessions[5:10] if len(sessions) > 5 else []
 
         if recent_sessions and older_sessions:
-            recent_volume = sum(
-                sum(weights) for s in recent_sessions for ex in s.exercises
-                if ex.weights_kg and isinstance(ex.weights_kg, list) for weights in [ex.weights_kg]
-            )
-            older_volume = sum(
-                sum(weights) for s in older_sessions for ex in s.exercises
-                if ex.weights_kg and isinstance(ex.weights_kg, list) for weights in [ex.weights_kg]
-            )
+            recent_volume = self._sum_weights_kg(ex for s in recent_sessions for ex in s.exercises)
+            older_volume = self._sum_weights_kg(ex for s in older_sessions for ex in s.exercises)
 
             if older_volume > 0:
                 volume_change_percent = (recent_volume - older_volume) / older_volume * 100
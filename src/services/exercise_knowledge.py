@@ -1,8 +1,8 @@
 """Base de conhecimento de exercícios para inferência automática
 """
-import logging
+from config.logging_config import get_logger
 
-logger = logging.getLogger(__file__)
+logger = get_logger(__name__)
 
 # Mapeamento: Exercício → Grupo Muscular Primário
 EXERCISE_TO_MUSCLE = {
@@ -210,10 +210,8 @@ def infer_muscle_group(exercise_name: str, exercise_type: str = "resistencia") -
 
     """
     exercise_lower = exercise_name.lower()
-    logger.info(f"Exercício a ser inferido o musculo: {exercise_lower} (tipo: {exercise_type})")
+    logger.info("Exercício a ser inferido o musculo: %s (tipo: %s)", exercise_lower, exercise_type)
 
-    print(exercise_type)
-    print(exercise_name)
     # Para exercícios aeróbicos, usar mapeamento específico
     if exercise_type.lower() == "aerobico":
         for keyword, muscle in AEROBIC_TO_MUSCLE.items():
@@ -238,7 +236,7 @@ def infer_equipment(exercise_name: str, exercise_type: str = "resistencia") -> s
     """
     exercise_lower = exercise_name.lower()
 
-    logger.info(f"Exercício a ser inferido o equipamento: {exercise_lower} (tipo: {exercise_type})")
+    logger.info("Exercício a ser inferido o equipamento: %s (tipo: %s)", exercise_lower, exercise_type)
 
     # Para exercícios aeróbicos, usar mapeamento específico
     if exercise_type.lower() == "aerobico":
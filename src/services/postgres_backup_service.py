@@ -1,15 +1,14 @@
 """PostgreSQL backup service for remote databases"""
 
 import asyncio
-import json
-import subprocess
+import shutil
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 import os
 
-import aiofiles
-from sqlalchemy import text
+import orjson
+from sqlalchemy import column, select, table
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config.logging_config import get_logger
@@ -20,6 +19,62 @@ from services.exceptions import BackupError, ErrorCode
 
 logger = get_logger(__name__)
 
+# Fetch JSON export rows in batches instead of materializing whole tables
+_STREAM_OPTIONS = {"yield_per": 1000}
+
+
+def _isoformat(value: Any) -> str:
+    """Serialize date/time values (SQLite may hand them back as strings)"""
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def _enum_value(value: Any) -> str:
+    """Serialize enum values (raw SQL may hand them back as strings)"""
+    return value.value if hasattr(value, "value") else str(value)
+
+
+# Exported columns per table, in output order, with the encoder applied to
+# non-null values (None means the value is written as-is)
+_EXPORT_COLUMNS: Dict[str, Tuple[Tuple[str, Optional[Callable[[Any], str]]], ...]] = {
+    "users": (
+        ("user_id", None), ("username", None), ("first_name", None), ("last_name", None),
+        ("is_admin", None), ("is_active", None), ("created_at", _isoformat), ("updated_at", _isoformat),
+        ("created_by", None),
+    ),
+    "exercises": (
+        ("exercise_id", None), ("name", None), ("type", _enum_value), ("muscle_group", None),
+        ("equipment", None), ("description", None),
+    ),
+    "workout_sessions": (
+        ("session_id", None), ("user_id", None), ("date", _isoformat), ("start_time", _isoformat),
+        ("end_time", _isoformat), ("body_weight_kg", None), ("energy_level", None), ("notes", None),
+        ("created_at", _isoformat), ("duration_minutes", None), ("original_transcription", None),
+        ("llm_model_used", None), ("processing_time_seconds", None), ("status", _enum_value),
+        ("last_update", _isoformat), ("audio_count", None),
+    ),
+    "workout_exercises": (
+        ("workout_exercise_id", None), ("session_id", None), ("exercise_id", None), ("order_in_workout", None),
+        ("sets", None), ("reps", None), ("weights_kg", None), ("rest_seconds", None),
+        ("perceived_difficulty", None), ("notes", None),
+    ),
+    "aerobic_exercises": (
+        ("aerobic_id", None), ("session_id", None), ("exercise_id", None), ("duration_minutes", None),
+        ("distance_km", None), ("average_heart_rate", None), ("calories_burned", None),
+        ("intensity_level", None), ("notes", None),
+    ),
+    "session_audios": (
+        ("audio_id", None), ("session_id", None), ("audio_number", None), ("transcription", None),
+        ("created_at", _isoformat),
+    ),
+}
+
+# Explicit-column SELECTs, built once. The columns are untyped on purpose so
+# values come back exactly as the driver returns them (e.g. enum names)
+_EXPORT_SELECTS = {
+    name: select(table(name, *(column(col) for col, _ in columns)))
+    for name, columns in _EXPORT_COLUMNS.items()
+}
+
 
 class PostgreSQLBackupService:
     """Backup service for PostgreSQL databases (local and remote)"""
@@ -28,6 +83,10 @@ class PostgreSQLBackupService:
         self.backup_dir = Path(backup_dir or "./backups")
         self.max_backups = max_backups
         self.database_url = settings.DATABASE_URL
+        self.sql_compression = settings.BACKUP_SQL_COMPRESSION
+        self.sql_compression_level = settings.BACKUP_SQL_ZSTD_LEVEL
+        # Client tools already found on PATH (pg_dump, psql)
+        self._available_tools: Set[str] = set()
         
         # Ensure backup directory exists
         self.backup_dir.mkdir(exist_ok=True)
@@ -35,22 +94,6 @@ class PostgreSQLBackupService:
         logger.info(f"PostgreSQL backup service initialized: {self.backup_dir}")
         logger.info(f"Database URL: {self._safe_url()}")
         
-    def _safe_serialize_datetime(self, dt_value) -> Optional[str]:
-        """Safely serialize datetime/date/time objects to ISO format string"""
-        if dt_value is None:
-            return None
-        if hasattr(dt_value, 'isoformat'):
-            return dt_value.isoformat()
-        return str(dt_value)
-        
-    def _safe_serialize_enum(self, enum_value) -> Optional[str]:
-        """Safely serialize enum objects to string"""
-        if enum_value is None:
-            return None
-        if hasattr(enum_value, 'value'):
-            return enum_value.value
-        return str(enum_value)
-        
     def _safe_url(self) -> str:
         """Return database URL with password hidden"""
         if "@" in self.database_url:
@@ -59,50 +102,140 @@ class PostgreSQLBackupService:
             return prefix + parts[1]
         return self.database_url
     
+    def _require_client_tool(self, tool: str) -> None:
+        """Raise BackupError unless a PostgreSQL client tool is on PATH
+        
+        Only successful lookups are cached, so installing the tool later
+        does not require a restart.
+        """
+        if tool in self._available_tools:
+            return
+        if shutil.which(tool) is None:
+            raise BackupError(
+                f"{tool} not found. Install PostgreSQL client tools.",
+                error_code=ErrorCode.FILE_NOT_FOUND
+            )
+        self._available_tools.add(tool)
+    
+    @staticmethod
+    async def _wait_for_client(process: asyncio.subprocess.Process) -> bytes:
+        """Wait for a pg_dump/psql process and return its stderr
+        
+        The process is killed if the wait is cancelled or fails.
+        """
+        try:
+            _, stderr = await process.communicate()
+        except BaseException:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+        return stderr
+    
+    async def _spawn_psql(self, stdin: Any) -> asyncio.subprocess.Process:
+        """Start psql feeding it a SQL script from `stdin`"""
+        return await asyncio.create_subprocess_exec(
+            "psql",
+            self.database_url,
+            "--quiet",
+            stdin=stdin,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+    
+    async def _restore_compressed(self, backup_path: str) -> Tuple[asyncio.subprocess.Process, bytes]:
+        """Run psql on a zstd-compressed dump and return it with its stderr
+        
+        zstd decompresses into psql through an OS pipe, so the dump never
+        passes through Python.
+        """
+        read_fd, write_fd = os.pipe()
+        try:
+            decompress = await asyncio.create_subprocess_exec(
+                "zstd", "-dcq", backup_path,
+                stdout=write_fd,
+                stderr=asyncio.subprocess.PIPE
+            )
+        except BaseException:
+            os.close(read_fd)
+            raise
+        finally:
+            os.close(write_fd)
+        
+        try:
+            try:
+                result = await self._spawn_psql(read_fd)
+            finally:
+                os.close(read_fd)
+            stderr, decompress_stderr = await asyncio.gather(
+                self._wait_for_client(result), self._wait_for_client(decompress)
+            )
+        except BaseException:
+            if decompress.returncode is None:
+                decompress.kill()
+                await decompress.wait()
+            raise
+        
+        # psql errors take precedence; a zstd failure alone means the dump was truncated
+        if result.returncode == 0 and decompress.returncode != 0:
+            error_msg = decompress_stderr.decode() if decompress_stderr else "Unknown zstd error"
+            raise BackupError(
+                f"zstd decompression failed: {error_msg}",
+                error_code=ErrorCode.RESTORE_FAILED
+            )
+        return result, stderr
+    
     async def create_backup_sql(self, backup_name: str = None) -> str:
-        """Create SQL backup using pg_dump (requires pg_dump installed)"""
+        """Create SQL backup using pg_dump (requires pg_dump installed)
+        
+        Backups named *.sql.zst are compressed by pg_dump itself with zstd
+        (pg_dump 16+); the default name follows BACKUP_SQL_COMPRESSION.
+        """
         try:
             if not backup_name:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                backup_name = f"gym_tracker_backup_{timestamp}.sql"
+                extension = ".sql.zst" if self.sql_compression else ".sql"
+                backup_name = f"gym_tracker_backup_{timestamp}{extension}"
             
             backup_path = self.backup_dir / backup_name
             
-            # Check if pg_dump is available
-            try:
-                subprocess.run(["pg_dump", "--version"], 
-                             capture_output=True, check=True)
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                raise BackupError(
-                    "pg_dump not found. Install PostgreSQL client tools.",
-                    error_code=ErrorCode.FILE_NOT_FOUND
-                )
-            
-            logger.info(f"Creating SQL backup: {backup_name}")
+            self._require_client_tool("pg_dump")
             
-            # Run pg_dump
-            result = await asyncio.create_subprocess_exec(
-                "pg_dump", 
+            # No --verbose: stderr is only needed for the error message, so
+            # keep it down to warnings and errors instead of per-table progress
+            args = [
                 self.database_url,
-                "--verbose",
                 "--no-password",  # Use connection string auth
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
+            ]
+            if backup_name.endswith(".zst"):
+                args.append(f"--compress=zstd:{self.sql_compression_level}")
+            
+            logger.info(f"Creating SQL backup: {backup_name}")
             
-            stdout, stderr = await result.communicate()
+            # Run pg_dump writing straight into the backup file, so the dump
+            # never passes through Python; only stderr is piped back
+            f = await asyncio.to_thread(open, backup_path, "wb")
+            try:
+                with f:
+                    result = await asyncio.create_subprocess_exec(
+                        "pg_dump",
+                        *args,
+                        stdout=f,
+                        stderr=asyncio.subprocess.PIPE
+                    )
+                stderr = await self._wait_for_client(result)
+            except BaseException:
+                backup_path.unlink(missing_ok=True)
+                raise
             
             if result.returncode != 0:
+                backup_path.unlink(missing_ok=True)
                 error_msg = stderr.decode() if stderr else "Unknown pg_dump error"
                 raise BackupError(
                     f"pg_dump failed: {error_msg}",
                     error_code=ErrorCode.BACKUP_FAILED
                 )
             
-            # Save backup to file
-            async with aiofiles.open(backup_path, "wb") as f:
-                await f.write(stdout)
-            
             logger.info(f"SQL backup created: {backup_path}")
             return str(backup_path)
             
@@ -116,6 +249,28 @@ class PostgreSQLBackupService:
                 cause=e
             )
     
+    async def _export_table(self, table_name: str) -> List[Dict[str, Any]]:
+        """Export every row of a table using its own session"""
+        columns = _EXPORT_COLUMNS[table_name]
+        names = [name for name, _ in columns]
+        encoded = [(index, encode) for index, (_, encode) in enumerate(columns) if encode is not None]
+        
+        rows = []
+        async with get_async_session_context() as session:
+            result = await session.stream(_EXPORT_SELECTS[table_name], execution_options=_STREAM_OPTIONS)
+            async for partition in result.tuples().partitions():
+                if not encoded:
+                    rows.extend(dict(zip(names, values)) for values in partition)
+                    continue
+                for values in partition:
+                    # Only the few date/enum columns need converting
+                    values = list(values)
+                    for index, encode in encoded:
+                        if values[index] is not None:
+                            values[index] = encode(values[index])
+                    rows.append(dict(zip(names, values)))
+        return rows
+    
     async def create_backup_json(self, backup_name: str = None) -> str:
         """Create JSON backup by exporting all data"""
         try:
@@ -136,100 +291,13 @@ class PostgreSQLBackupService:
                 "data": {}
             }
             
-            async with get_async_session_context() as session:
-                # Export Users
-                users_result = await session.execute(text("SELECT * FROM users"))
-                users = []
-                for row in users_result:
-                    users.append({
-                        "user_id": row.user_id,
-                        "username": row.username,
-                        "first_name": row.first_name,
-                        "last_name": row.last_name,
-                        "is_admin": row.is_admin,
-                        "is_active": row.is_active,
-                        "created_at": self._safe_serialize_datetime(row.created_at),
-                        "updated_at": self._safe_serialize_datetime(row.updated_at),
-                        "created_by": row.created_by
-                    })
-                backup_data["data"]["users"] = users
-                
-                # Export Exercises
-                exercises_result = await session.execute(text("SELECT * FROM exercises"))
-                exercises = []
-                for row in exercises_result:
-                    exercises.append({
-                        "exercise_id": row.exercise_id,
-                        "name": row.name,
-                        "type": self._safe_serialize_enum(row.type),
-                        "muscle_group": row.muscle_group,
-                        "equipment": row.equipment,
-                        "description": row.description
-                    })
-                backup_data["data"]["exercises"] = exercises
-                
-                # Export Workout Sessions
-                sessions_result = await session.execute(text("SELECT * FROM workout_sessions"))
-                sessions = []
-                for row in sessions_result:
-                    sessions.append({
-                        "session_id": row.session_id,
-                        "user_id": row.user_id,
-                        "date": self._safe_serialize_datetime(row.date),
-                        "start_time": self._safe_serialize_datetime(row.start_time),
-                        "end_time": self._safe_serialize_datetime(row.end_time),
-                        "body_weight_kg": row.body_weight_kg,
-                        "energy_level": row.energy_level,
-                        "notes": row.notes,
-                        "created_at": self._safe_serialize_datetime(row.created_at),
-                        "duration_minutes": row.duration_minutes,
-                        "original_transcription": row.original_transcription,
-                        "llm_model_used": row.llm_model_used,
-                        "processing_time_seconds": row.processing_time_seconds,
-                        "status": self._safe_serialize_enum(row.status),
-                        "last_update": self._safe_serialize_datetime(row.last_update),
-                        "audio_count": row.audio_count
-                    })
-                backup_data["data"]["workout_sessions"] = sessions
-                
-                # Export Workout Exercises
-                we_result = await session.execute(text("SELECT * FROM workout_exercises"))
-                workout_exercises = []
-                for row in we_result:
-                    workout_exercises.append({
-                        "workout_exercise_id": row.workout_exercise_id,
-                        "session_id": row.session_id,
-                        "exercise_id": row.exercise_id,
-                        "order_in_workout": row.order_in_workout,
-                        "sets": row.sets,
-                        "reps": row.reps,
-                        "weights_kg": row.weights_kg,
-                        "rest_seconds": row.rest_seconds,
-                        "perceived_difficulty": row.perceived_difficulty,
-                        "notes": row.notes
-                    })
-                backup_data["data"]["workout_exercises"] = workout_exercises
-                
-                # Export Aerobic Exercises
-                ae_result = await session.execute(text("SELECT * FROM aerobic_exercises"))
-                aerobic_exercises = []
-                for row in ae_result:
-                    aerobic_exercises.append({
-                        "aerobic_id": row.aerobic_id,
-                        "session_id": row.session_id,
-                        "exercise_id": row.exercise_id,
-                        "duration_minutes": row.duration_minutes,
-                        "distance_km": row.distance_km,
-                        "average_heart_rate": row.average_heart_rate,
-                        "calories_burned": row.calories_burned,
-                        "intensity_level": row.intensity_level,
-                        "notes": row.notes
-                    })
-                backup_data["data"]["aerobic_exercises"] = aerobic_exercises
+            # Each table is read on its own pooled connection, concurrently
+            exported = await asyncio.gather(*(self._export_table(table) for table in _EXPORT_COLUMNS))
+            backup_data["data"] = dict(zip(_EXPORT_COLUMNS, exported))
             
-            # Save to JSON file
-            async with aiofiles.open(backup_path, "w", encoding="utf-8") as f:
-                await f.write(json.dumps(backup_data, indent=2, ensure_ascii=False))
+            # Save to JSON file (orjson emits UTF-8 bytes directly)
+            payload = orjson.dumps(backup_data, option=orjson.OPT_INDENT_2)
+            await asyncio.to_thread(backup_path.write_bytes, payload)
             
             logger.info(f"JSON backup created: {backup_path}")
             return str(backup_path)
@@ -257,30 +325,21 @@ class PostgreSQLBackupService:
                     error_code=ErrorCode.FILE_NOT_FOUND
                 )
             
-            # Check if psql is available
-            try:
-                subprocess.run(["psql", "--version"], 
-                             capture_output=True, check=True)
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                raise BackupError(
-                    "psql not found. Install PostgreSQL client tools.",
-                    error_code=ErrorCode.FILE_NOT_FOUND
-                )
+            self._require_client_tool("psql")
+            compressed = backup_path.endswith(".zst")
+            if compressed:
+                self._require_client_tool("zstd")
             
             logger.warning(f"Starting database restore from SQL: {backup_path}")
             
-            # Run psql to restore
-            with open(backup_path, "r") as f:
-                result = await asyncio.create_subprocess_exec(
-                    "psql",
-                    self.database_url,
-                    "--quiet",
-                    stdin=asyncio.subprocess.PIPE,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                
-                stdout, stderr = await result.communicate(input=f.read().encode())
+            if compressed:
+                result, stderr = await self._restore_compressed(backup_path)
+            else:
+                # Run psql reading the dump file directly as its stdin
+                f = await asyncio.to_thread(open, backup_path, "rb")
+                with f:
+                    result = await self._spawn_psql(f)
+                stderr = await self._wait_for_client(result)
             
             if result.returncode != 0:
                 error_msg = stderr.decode() if stderr else "Unknown psql error"
@@ -302,34 +361,38 @@ class PostgreSQLBackupService:
                 cause=e
             )
     
+    def _scan_backup_dir(self) -> List[Dict[str, Any]]:
+        """Collect info for every .sql/.sql.zst/.json backup in the backup directory"""
+        backups = []
+        with os.scandir(self.backup_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.name.endswith((".sql", ".sql.zst", ".json")):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError as e:
+                    logger.warning(f"Error reading backup info: {entry.name} - {e}")
+                    continue
+                
+                backups.append({
+                    "name": entry.name,
+                    "path": str(self.backup_dir / entry.name),
+                    "type": "json" if entry.name.endswith(".json") else "sql",
+                    # st_ctime is the inode change time on POSIX, not creation
+                    "created": datetime.fromtimestamp(stat.st_mtime),
+                    "size_mb": round(stat.st_size / (1024 * 1024), 2)
+                })
+        return backups
+    
     async def list_backups(self) -> List[Dict[str, Any]]:
         """List all available backups"""
         try:
-            backups = []
-            
-            backup_files = await asyncio.to_thread(
-                lambda: list(self.backup_dir.glob("*.sql")) + list(self.backup_dir.glob("*.json"))
-            )
+            # One directory scan and all stats in a single thread hop
+            backups = await asyncio.to_thread(self._scan_backup_dir)
             
-            for backup_file in backup_files:
-                try:
-                    stat = await asyncio.to_thread(backup_file.stat)
-                    size_mb = stat.st_size / (1024 * 1024)
-                    
-                    backup_info = {
-                        "name": backup_file.name,
-                        "path": str(backup_file),
-                        "type": "sql" if backup_file.suffix == ".sql" else "json",
-                        "created": datetime.fromtimestamp(stat.st_ctime),
-                        "size_mb": round(size_mb, 2)
-                    }
-                    backups.append(backup_info)
-                    
-                except Exception as e:
-                    logger.warning(f"Error reading backup info: {backup_file.name} - {e}")
-                    continue
-            
-            # Sort by creation date (newest first)
+            # Sort by modification date (newest first)
             backups.sort(key=lambda x: x["created"], reverse=True)
             return backups
             
@@ -341,6 +404,17 @@ class PostgreSQLBackupService:
                 cause=e
             )
     
+    @staticmethod
+    def _remove_files(paths: List[str]) -> Dict[str, OSError]:
+        """Delete files, returning the error for each one that failed"""
+        failures = {}
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError as e:
+                failures[path] = e
+        return failures
+    
     async def cleanup_old_backups(self):
         """Remove old backups beyond max_backups limit"""
         try:
@@ -350,17 +424,19 @@ class PostgreSQLBackupService:
                 logger.debug(f"Backup cleanup not needed: {len(backups)}/{self.max_backups}")
                 return
             
-            # Remove oldest backups
+            # Remove oldest backups, all in a single worker thread hop
             backups_to_remove = backups[self.max_backups:]
+            failures = await asyncio.to_thread(self._remove_files, [b["path"] for b in backups_to_remove])
             
             for backup in backups_to_remove:
-                try:
-                    await asyncio.to_thread(os.remove, backup["path"])
+                error = failures.get(backup["path"])
+                if error is None:
                     logger.info(f"Removed old backup: {backup['name']}")
-                except Exception as e:
-                    logger.warning(f"Failed to remove backup {backup['name']}: {e}")
+                else:
+                    logger.warning(f"Failed to remove backup {backup['name']}: {error}")
             
-            logger.info(f"Backup cleanup completed: removed {len(backups_to_remove)} old backups")
+            removed = len(backups_to_remove) - len(failures)
+            logger.info(f"Backup cleanup completed: removed {removed} old backups")
             
         except Exception:
             logger.exception("Backup cleanup failed")
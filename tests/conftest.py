@@ -310,6 +310,40 @@ async def populated_test_database(test_db_path):
             os.environ.pop("DATABASE_URL", None)
 
 
+@pytest.fixture
+def apply_session_update():
+    """Apply the SQL expressions a service assigned to a (mock) WorkoutSession
+
+    Counter and notes updates are SQL expressions evaluated by the database,
+    so this runs them against a real in-memory row seeded with `row` values
+    and returns the resulting (audio_count, notes).
+    """
+    from sqlalchemy import create_engine, insert, select, update
+    from sqlalchemy.sql import ClauseElement
+
+    from database.models import Base, WorkoutSession
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+
+    def apply(workout_session, **row):
+        values = {
+            name: getattr(workout_session, name)
+            for name in ("audio_count", "notes")
+            if isinstance(getattr(workout_session, name, None), ClauseElement)
+        }
+        with engine.begin() as conn:
+            result = conn.execute(insert(WorkoutSession).values(user_id="test", **row))
+            session_id = result.inserted_primary_key[0]
+            where = WorkoutSession.session_id == session_id
+            if values:
+                conn.execute(update(WorkoutSession).where(where).values(**values))
+            return conn.execute(select(WorkoutSession.audio_count, WorkoutSession.notes).where(where)).one()
+
+    yield apply
+    engine.dispose()
+
+
 # Legacy sync fixture for backward compatibility
 @pytest.fixture(scope="function")
 def sync_test_database(test_db_path):
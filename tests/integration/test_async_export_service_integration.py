@@ -0,0 +1,197 @@
+"""Integration tests for AsyncExportService
+
+Exercises the export service against a real SQLite database, checking that
+the CSV and JSON outputs reflect the stored sessions and exercises.
+"""
+
+import csv
+import json
+import os
+from datetime import date, time
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+
+from database.async_connection import get_async_session_context
+from database.models import AerobicExercise, Exercise, ExerciseType, SessionStatus, WorkoutExercise, WorkoutSession
+from services.async_export_service import AsyncExportService
+from services.exceptions import ValidationError
+
+USER_ID = "export_user"
+
+
+@pytest.fixture
+def export_service():
+    return AsyncExportService()
+
+
+@pytest.fixture
+async def export_user_data(clean_test_database):
+    """Create one finished session with exercises and one empty active session"""
+    async with get_async_session_context() as session:
+        supino = Exercise(name="supino reto", type=ExerciseType.RESISTENCIA, muscle_group="chest")
+        corrida = Exercise(name="corrida", type=ExerciseType.AEROBICO)
+        session.add_all([supino, corrida])
+
+        finished = WorkoutSession(
+            user_id=USER_ID,
+            date=date(2024, 1, 10),
+            start_time=time(10, 0),
+            duration_minutes=60,
+            notes="Treino, pesado",
+            status=SessionStatus.FINALIZADA,
+        )
+        finished.exercises.append(WorkoutExercise(
+            exercise=supino, sets=3, reps=[12, 10, 8], weights_kg=[40, 50, 60], rest_seconds=90,
+        ))
+        finished.aerobics.append(AerobicExercise(
+            exercise=corrida, duration_minutes=20.0, distance_km=3.5, calories_burned=200,
+            intensity_level="moderate",
+        ))
+        active = WorkoutSession(
+            user_id=USER_ID,
+            date=date(2024, 1, 12),
+            start_time=time(9, 0),
+            notes="Só aquecimento",
+            status=SessionStatus.ATIVA,
+        )
+        session.add_all([finished, active])
+        await session.commit()
+        return finished.session_id, active.session_id
+
+
+class TestAsyncExportServiceIntegration:
+    """Test AsyncExportService with real database operations"""
+
+    @pytest.mark.asyncio
+    async def test_csv_export_rows(self, export_service, export_user_data):
+        finished_id, active_id = export_user_data
+
+        result = await export_service.export_user_data(USER_ID, format="csv")
+
+        assert result.success is True
+        rows = list(csv.DictReader(StringIO(result.data.decode())))
+        assert len(rows) == 3
+
+        # Newest session first; sessions without exercises get a single row
+        assert rows[0]["session_id"] == str(active_id)
+        assert rows[0]["exercise_type"] == ""
+        assert rows[0]["notes"] == "Só aquecimento"
+
+        assert rows[1]["session_id"] == str(finished_id)
+        assert rows[1]["exercise_type"] == "resistance"
+        assert rows[1]["exercise_name"] == "supino reto"
+        assert rows[1]["status"] == "finalizada"
+        assert rows[1]["reps"] == "[12, 10, 8]"
+
+        assert rows[2]["exercise_type"] == "aerobic"
+        assert rows[2]["exercise_name"] == "corrida"
+        assert rows[2]["distance_km"] == "3.5"
+
+    @pytest.mark.asyncio
+    async def test_csv_export_finished_only(self, export_service, export_user_data):
+        finished_id, _ = export_user_data
+
+        result = await export_service.export_user_data(USER_ID, format="csv", include_active=False)
+
+        rows = list(csv.DictReader(StringIO(result.data.decode())))
+        assert {row["session_id"] for row in rows} == {str(finished_id)}
+        assert result.summary.total_sessions == 1
+        assert result.summary.active_sessions == 0
+        assert result.summary.total_exercises == 2
+        assert result.summary.total_duration_minutes == 60
+
+    @pytest.mark.asyncio
+    async def test_json_export_structure(self, export_service, export_user_data):
+        finished_id, _ = export_user_data
+
+        result = await export_service.export_user_data(USER_ID, format="json")
+
+        data = json.loads(result.data)
+        assert data["export_info"]["total_sessions"] == 2
+        assert data["export_info"]["export_date"] == result.export_date
+        finished = next(s for s in data["sessions"] if s["session_id"] == finished_id)
+        assert finished["workout_exercises"][0]["reps"] == [12, 10, 8]
+        assert finished["aerobic_exercises"][0]["exercise_name"] == "corrida"
+        assert result.summary.total_exercises == 2
+
+    @pytest.mark.asyncio
+    async def test_raw_export_matches_json(self, export_service, export_user_data):
+        raw = await export_service.export_user_data(USER_ID, format="raw")
+        as_json = await export_service.export_user_data(USER_ID, format="json")
+
+        assert raw.success is True
+        assert raw.data == b""
+        assert raw.records == json.loads(as_json.data)["sessions"]
+
+    @pytest.mark.asyncio
+    async def test_raw_export_rejects_output_path(self, export_service, temp_dir):
+        with pytest.raises(ValidationError):
+            await export_service.export_user_data(
+                USER_ID, format="raw", output_path=os.path.join(temp_dir, "raw.out"),
+            )
+
+    @pytest.mark.asyncio
+    async def test_csv_export_to_file_matches_in_memory(self, export_service, export_user_data, temp_dir):
+        output_path = os.path.join(temp_dir, "export.csv")
+
+        in_memory = await export_service.export_user_data(USER_ID, format="csv")
+        streamed = await export_service.export_user_data(USER_ID, format="csv", output_path=output_path)
+
+        assert streamed.success is True
+        assert streamed.data == b""
+        assert streamed.file_path == output_path
+        with open(output_path, "rb") as f:
+            assert f.read() == in_memory.data
+
+    @pytest.mark.asyncio
+    async def test_streamed_exports_with_small_batches(self, export_service, export_user_data, temp_dir):
+        """Batch boundaries must not change the exported content"""
+        csv_before = await export_service.export_user_data(USER_ID, format="csv")
+        json_path = os.path.join(temp_dir, "export.json")
+
+        with patch("services.async_export_service._CSV_ROW_BATCH", 1), \
+                patch("services.async_export_service._JSON_SESSION_BATCH", 1):
+            csv_after = await export_service.export_user_data(USER_ID, format="csv")
+            await export_service.export_user_data(USER_ID, format="json", output_path=json_path)
+
+        assert csv_after.data == csv_before.data
+        with open(json_path, encoding="utf-8") as f:
+            data = json.load(f)
+        assert len(data["sessions"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_export_loader_raises_on_lazy_load(self, export_service, export_user_data):
+        """Attributes the exporter does not eager-load must not be lazy-loaded"""
+        stmt = export_service._user_sessions_statement(export_service._session_filters(USER_ID))
+
+        async with get_async_session_context() as session:
+            sessions = (await session.execute(stmt)).scalars().all()
+
+            finished = next(s for s in sessions if s.exercises)
+            assert finished.exercises[0].exercise.name == "supino reto"
+            with pytest.raises(InvalidRequestError):
+                finished.original_transcription
+            with pytest.raises(InvalidRequestError):
+                finished.exercises[0].session
+
+    @pytest.mark.asyncio
+    async def test_export_summary_preview(self, export_service, export_user_data):
+        preview = await export_service.get_export_summary(USER_ID)
+
+        assert preview.total_sessions == 2
+        assert preview.completed_sessions == 1
+        assert preview.active_sessions == 1
+        assert preview.resistance_exercises == 1
+        assert preview.aerobic_exercises == 1
+        assert preview.date_range.start == "10/01/2024"
+        assert preview.date_range.end == "12/01/2024"
+
+    @pytest.mark.asyncio
+    async def test_export_without_data(self, export_service, clean_test_database):
+        result = await export_service.export_user_data("nobody", format="csv")
+
+        assert result.success is False
+        assert result.summary.total_sessions == 0
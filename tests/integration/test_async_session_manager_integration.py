@@ -7,10 +7,14 @@ session lifecycle management, and database consistency.
 import pytest
 import asyncio
 from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from sqlalchemy import select
 
 from services.async_session_manager import AsyncSessionManager
 from services.exceptions import ValidationError, DatabaseError, ErrorCode
-from database.models import SessionStatus, WorkoutSession
+from database.async_connection import get_async_session_context
+from database.models import SessionAudio, SessionStatus, WorkoutSession
 
 
 class TestSessionManagerIntegration:
@@ -49,6 +53,10 @@ class TestSessionLifecycleIntegration(TestSessionManagerIntegration):
         assert session.user_id == user_id
         assert session.status == SessionStatus.ATIVA
         assert session.audio_count == 0
+        assert session.session_id is not None
+        assert session.created_at is not None
+        assert session.last_update == session.created_at
+        assert session.created_at == datetime.combine(session.date, session.start_time)
         
         # Retrieve the same session
         retrieved_session = await session_manager.get_session_by_id(session.session_id, user_id)
@@ -70,6 +78,31 @@ class TestSessionLifecycleIntegration(TestSessionManagerIntegration):
         assert is_new2 is False
         assert session1.session_id == session2.session_id
 
+    @pytest.mark.asyncio
+    async def test_session_reuse_skips_latest_session_query(self, session_manager, cleanup_sessions):
+        """Reusing the session handed out last is a primary-key lookup"""
+        user_id = "test_cached_reuse_user"
+        session1, _ = await session_manager.get_or_create_session(user_id)
+
+        with patch.object(session_manager, "_get_latest_session", wraps=session_manager._get_latest_session) as latest:
+            session2, is_new = await session_manager.get_or_create_session(user_id)
+
+        assert is_new is False
+        assert session2.session_id == session1.session_id
+        latest.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_finished_cached_session_is_not_reused(self, session_manager, cleanup_sessions):
+        """Sessions finished outside the manager's cache start a new one"""
+        user_id = "test_cached_finish_user"
+        session1, _ = await session_manager.get_or_create_session(user_id)
+        await AsyncSessionManager().batch_finish_sessions([session1.session_id])
+
+        session2, is_new = await session_manager.get_or_create_session(user_id)
+
+        assert is_new is True
+        assert session2.session_id != session1.session_id
+
     @pytest.mark.asyncio
     async def test_session_metadata_update_workflow(self, session_manager, cleanup_sessions):
         """Test updating session metadata"""
@@ -94,6 +127,28 @@ class TestSessionLifecycleIntegration(TestSessionManagerIntegration):
         assert updated_session.processing_time_seconds == 1.5
         assert updated_session.llm_model_used == "gpt-4"
 
+    @pytest.mark.asyncio
+    async def test_transcription_history(self, session_manager, cleanup_sessions):
+        """Test each transcription is kept as its own SessionAudio row"""
+        session, _ = await session_manager.get_or_create_session("test_transcription_history_user")
+
+        for number, text in enumerate(["supino 3x10", "agachamento 4x8", "corrida 20 min"], start=1):
+            # audio_count is bumped by the workout service before the metadata update
+            await session_manager.update_session_metadata(
+                session.session_id, transcription=text, audio_count=number,
+            )
+        await session_manager.update_session_metadata(session.session_id, processing_time=2.0)
+
+        async with get_async_session_context() as db_session:
+            result = await db_session.execute(
+                select(SessionAudio.audio_number, SessionAudio.transcription)
+                .where(SessionAudio.session_id == session.session_id)
+                .order_by(SessionAudio.audio_number)
+            )
+            assert result.all() == [(1, "supino 3x10"), (2, "agachamento 4x8"), (3, "corrida 20 min")]
+        updated_session = await session_manager.get_session_by_id(session.session_id)
+        assert updated_session.original_transcription == "corrida 20 min"
+
     @pytest.mark.asyncio
     async def test_session_history_retrieval(self, session_manager, cleanup_sessions):
         """Test retrieving user session history"""
@@ -235,6 +290,31 @@ class TestSessionTimeoutAndCleanup(TestSessionManagerIntegration):
         assert updated_session.duration_minutes is not None
         assert updated_session.duration_minutes >= 0
 
+    @pytest.mark.asyncio
+    async def test_stale_sessions_finished_when_session_reused(self, session_manager, cleanup_sessions):
+        """The reuse path commits the stale-session cleanup it ran"""
+        from database.async_connection import get_async_session_context
+        from sqlalchemy import update
+
+        stale, _ = await session_manager.get_or_create_session("test_stale_other_user")
+        active, _ = await session_manager.get_or_create_session("test_stale_reuse_user")
+
+        old_time = datetime.now() - timedelta(hours=5)
+        async with get_async_session_context() as db_session:
+            await db_session.execute(
+                update(WorkoutSession)
+                .where(WorkoutSession.session_id == stale.session_id)
+                .values(date=old_time.date(), start_time=old_time.time(), last_update=old_time)
+            )
+            await db_session.commit()
+
+        reused, is_new = await session_manager.get_or_create_session("test_stale_reuse_user")
+
+        assert is_new is False
+        assert reused.session_id == active.session_id
+        updated_stale = await session_manager.get_session_by_id(stale.session_id)
+        assert updated_stale.status == SessionStatus.FINALIZADA
+
     @pytest.mark.asyncio
     async def test_active_session_count_accuracy(self, session_manager, cleanup_sessions):
         """Test active session counting accuracy"""
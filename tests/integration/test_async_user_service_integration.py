@@ -8,6 +8,9 @@ functionality and database consistency.
 import pytest
 from datetime import datetime
 
+from sqlalchemy import inspect, update
+
+from database.async_connection import _create_missing_indexes, async_db, get_async_session_context
 from services.async_user_service import AsyncUserService
 from services.exceptions import DatabaseError, ValidationError, ErrorCode
 from database.models import User
@@ -591,4 +594,67 @@ class TestConcurrentUserOperations(TestAsyncUserServiceIntegration):
                         break
                 else:
                     continue  # All remaining users are admin
-                break
\ No newline at end of file
+                break
+
+
+class TestAuthorizationCache(TestAsyncUserServiceIntegration):
+    """Test caching of authorization flags"""
+
+    async def _set_flags_directly(self, user_id, **values):
+        """Change a user behind the service's back"""
+        async with get_async_session_context() as session:
+            await session.execute(update(User).where(User.user_id == user_id).values(**values))
+            await session.commit()
+
+    @pytest.mark.asyncio
+    async def test_flags_are_served_from_cache(self, regular_user, user_service):
+        assert await user_service.is_user_authorized("user_test_456") is True
+
+        await self._set_flags_directly("user_test_456", is_active=False)
+
+        assert await user_service.is_user_authorized("user_test_456") is True
+        user_service._auth_cache.clear()
+        assert await user_service.is_user_authorized("user_test_456") is False
+
+    @pytest.mark.asyncio
+    async def test_writes_invalidate_cached_flags(self, regular_user, user_service):
+        assert await user_service.is_user_admin("user_test_456") is False
+        await user_service.update_user("user_test_456", is_admin=True)
+        assert await user_service.is_user_admin("user_test_456") is True
+
+        await user_service.remove_user("user_test_456")
+        assert await user_service.is_user_authorized("user_test_456") is False
+
+        await user_service.batch_update_user_info([{"user_id": "user_test_456", "is_active": True}])
+        assert await user_service.is_user_authorized("user_test_456") is True
+
+    @pytest.mark.asyncio
+    async def test_auth_state(self, admin_user, regular_user, user_service):
+        await user_service.add_user("inactive_admin", is_admin=True)
+        await user_service.remove_user("inactive_admin")
+
+        assert await user_service.get_auth_state("admin_test_123") == (True, True)
+        assert await user_service.get_auth_state("user_test_456") == (True, False)
+        assert await user_service.get_auth_state("inactive_admin") == (False, False)
+        assert await user_service.get_auth_state("nobody") == (False, False)
+
+    @pytest.mark.asyncio
+    async def test_unknown_user_becomes_authorized_when_added(self, clean_test_database, user_service):
+        assert await user_service.is_user_authorized("new_user") is False
+
+        await user_service.add_user("new_user", first_name="New")
+
+        assert await user_service.is_user_authorized("new_user") is True
+
+    @pytest.mark.asyncio
+    async def test_auth_index_added_to_existing_table(self, clean_test_database):
+        def index_names(connection):
+            return {index["name"] for index in inspect(connection).get_indexes("users")}
+
+        async with async_db.engine.begin() as conn:
+            await conn.exec_driver_sql("DROP INDEX ix_users_auth")
+            assert "ix_users_auth" not in await conn.run_sync(index_names)
+
+            await conn.run_sync(_create_missing_indexes)
+
+            assert "ix_users_auth" in await conn.run_sync(index_names)
@@ -0,0 +1,52 @@
+"""Integration tests for HealthService database queries"""
+
+from datetime import datetime, time, timedelta
+
+import pytest
+
+from database.async_connection import get_async_session_context
+from database.models import SessionStatus, User, WorkoutSession
+from services.async_health_service import HealthService
+
+
+@pytest.fixture
+async def health_data(clean_test_database):
+    """Two active users, one inactive, and sessions today and yesterday"""
+    today = datetime.now().date()
+    async with get_async_session_context() as session:
+        session.add_all([
+            User(user_id="1", first_name="Ana"),
+            User(user_id="2", first_name="Bruno"),
+            User(user_id="3", first_name="Caio", is_active=False),
+            WorkoutSession(user_id="1", date=today, start_time=time(8, 0), status=SessionStatus.ATIVA),
+            WorkoutSession(user_id="2", date=today, start_time=time(9, 0), status=SessionStatus.FINALIZADA),
+            WorkoutSession(
+                user_id="1", date=today - timedelta(days=1), start_time=time(8, 0),
+                status=SessionStatus.FINALIZADA,
+            ),
+        ])
+        await session.commit()
+
+
+class TestHealthServiceDatabase:
+    """Test HealthService against a real SQLite database"""
+
+    @pytest.mark.asyncio
+    async def test_database_metrics(self, health_data):
+        metrics = await HealthService()._get_database_metrics()
+
+        assert metrics.connection_status == "connected"
+        assert metrics.total_users == 2
+        assert metrics.total_sessions == 3
+        assert metrics.sessions_today == 2
+
+    @pytest.mark.asyncio
+    async def test_active_sessions_count(self, health_data):
+        assert await HealthService()._get_active_sessions_count() == 1
+
+    @pytest.mark.asyncio
+    async def test_check_database(self, clean_test_database):
+        result = await HealthService()._check_database()
+
+        assert result["status"] == "healthy"
+        assert result["attempts"] == 1
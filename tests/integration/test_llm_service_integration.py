@@ -317,7 +317,7 @@ class TestLLMParsingServiceErrorRecovery:
 
         with patch.object(service.client.chat.completions, "create", new_callable=AsyncMock) as mock_create:
             # Simulate API timeout
-            mock_create.side_effect = Exception("timeout occurred")
+            mock_create.side_effect = TimeoutError("timeout occurred")
 
             with pytest.raises(ServiceUnavailableError) as exc_info:
                 await service.parse_workout(transcription)
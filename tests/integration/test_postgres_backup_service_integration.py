@@ -0,0 +1,72 @@
+"""Integration tests for PostgreSQLBackupService
+
+The JSON export only uses portable SQL, so it is exercised here against the
+SQLite test database.
+"""
+
+import json
+from datetime import date, time
+from unittest.mock import patch
+
+import pytest
+
+from database.async_connection import get_async_session_context
+from database.models import (
+    Exercise, ExerciseType, SessionAudio, SessionStatus, User, WorkoutExercise, WorkoutSession,
+)
+from services.postgres_backup_service import PostgreSQLBackupService
+
+
+@pytest.fixture
+def backup_service(temp_dir):
+    return PostgreSQLBackupService(backup_dir=temp_dir, max_backups=2)
+
+
+@pytest.fixture
+async def backup_data(clean_test_database):
+    """One user with a finished session containing one exercise"""
+    async with get_async_session_context() as session:
+        supino = Exercise(name="supino reto", type=ExerciseType.RESISTENCIA, muscle_group="peito")
+        workout = WorkoutSession(
+            user_id="1", date=date(2024, 1, 10), start_time=time(10, 0),
+            notes="Treino ção", status=SessionStatus.FINALIZADA,
+        )
+        workout.exercises.append(WorkoutExercise(exercise=supino, sets=2, reps=[10, 8], weights_kg=[40, 50]))
+        workout.audios.append(SessionAudio(audio_number=1, transcription="supino 2 séries"))
+        session.add_all([User(user_id="1", first_name="Ana"), supino, workout])
+        await session.commit()
+
+
+class TestPostgreSQLBackupServiceJson:
+    """Test the JSON export against a real database"""
+
+    @pytest.mark.asyncio
+    async def test_json_backup_contents(self, backup_service, backup_data):
+        path = await backup_service.create_backup_json("backup.json")
+
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+
+        assert data["backup_info"]["backup_type"] == "json_export"
+        tables = data["data"]
+        assert [u["user_id"] for u in tables["users"]] == ["1"]
+        assert tables["exercises"][0]["name"] == "supino reto"
+        assert tables["workout_sessions"][0]["notes"] == "Treino ção"
+        assert tables["workout_sessions"][0]["date"].startswith("2024-01-10")
+        # Enums are exported as stored (member name), not the Python value
+        assert tables["workout_sessions"][0]["status"] == "FINALIZADA"
+        assert len(tables["workout_exercises"]) == 1
+        assert tables["aerobic_exercises"] == []
+        assert tables["session_audios"][0]["transcription"] == "supino 2 séries"
+
+    @pytest.mark.asyncio
+    async def test_json_backup_small_batches(self, backup_service, backup_data):
+        """Fetch batch size must not change the exported content"""
+        expected_path = await backup_service.create_backup_json("expected.json")
+        with patch("services.postgres_backup_service._STREAM_OPTIONS", {"yield_per": 1}):
+            path = await backup_service.create_backup_json("batched.json")
+
+        with open(expected_path, encoding="utf-8") as f:
+            expected = json.load(f)["data"]
+        with open(path, encoding="utf-8") as f:
+            assert json.load(f)["data"] == expected
@@ -412,7 +412,7 @@ class TestServiceErrorPropagation:
         health_service = HealthService()
 
         # Break database connection by patching the actual import
-        with patch("database.async_connection.get_async_session_context") as mock_session_context:
+        with patch("services.async_health_service.get_health_session_context") as mock_session_context:
             mock_session_context.side_effect = Exception("Database connection failed")
 
             # Health service should handle the error gracefully
@@ -0,0 +1,58 @@
+"""Unit tests for async_export_service.py helpers"""
+
+import csv
+from datetime import date
+from io import StringIO
+
+import pytest
+
+from database.models import SessionStatus
+from services.async_export_service import AsyncExportService, _csv_line
+
+
+class TestCsvLine:
+    """The hand-rolled CSV encoder must match csv.writer byte for byte"""
+
+    @pytest.mark.parametrize("row", [
+        (1, "2024-01-10", "finalizada", 60, "resistance", "supino reto", None),
+        ("[12, 10, 8]", 3.5, 80.25, 0, -1),
+        ('aspas "duplas"', "vírgula, aqui", "linha\nnova", "retorno\r", ""),
+        (None, None, None),
+        ("ação", "çãõ ü", " espaço inicial"),
+    ])
+    def test_matches_csv_writer(self, row):
+        """Test encoded rows equal csv.writer output"""
+        expected = StringIO()
+        csv.writer(expected).writerow(row)
+
+        assert _csv_line(row) == expected.getvalue()
+
+
+class TestCsvLines:
+    """Specialized row serialization for the fixed export layout"""
+
+    def test_lines_match_csv_writer(self):
+        """Test every row kind encodes like csv.writer would"""
+        session_cols = (7, date(2024, 1, 10), SessionStatus.FINALIZADA, 60, 'notas, "da" sessão')
+        rows = [
+            (*session_cols, 0, "supino reto", "chest", None, 3, [12, 10, 8], [40, 50.5, 60], 90,
+             None, None, None, None, "boa forma"),
+            (*session_cols, 0, None, None, None, 1, [10], None, None, None, None, None, None, None),
+            (*session_cols, 1, "corrida", None, None, None, None, None, None, 20.0, 3.5, 200, "moderate", "linha\nnova"),
+            (8, date(2024, 1, 9), SessionStatus.ATIVA, None, "sem exercícios", *(None,) * 13),
+        ]
+        expected_rows = [
+            (7, "2024-01-10", "finalizada", 60, "resistance", "supino reto", "chest", None, 3,
+             "[12, 10, 8]", "[40, 50.5, 60]", 90, None, None, None, None, "boa forma"),
+            (7, "2024-01-10", "finalizada", 60, "resistance", "Unknown", None, None, 1,
+             "[10]", None, None, None, None, None, None, None),
+            (7, "2024-01-10", "finalizada", 60, "aerobic", "corrida", None, None, None,
+             None, None, None, 20.0, 3.5, 200, "moderate", "linha\nnova"),
+            (8, "2024-01-09", "ativa", None, *(None,) * 12, "sem exercícios"),
+        ]
+        expected = StringIO()
+        csv.writer(expected).writerows(expected_rows)
+
+        lines = AsyncExportService()._iter_csv_lines(rows)
+
+        assert "".join(lines) == expected.getvalue()
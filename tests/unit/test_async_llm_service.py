@@ -1,7 +1,11 @@
 """Unit tests for LLMParsingService focusing on real functionality"""
 
+import asyncio
+import gc
 import json
+import httpx
 import pytest
+from groq import APIStatusError, APITimeoutError, AuthenticationError, RateLimitError
 from unittest.mock import AsyncMock, Mock, patch
 
 from config.settings import settings
@@ -14,6 +18,13 @@ from services.exceptions import (
 )
 
 
+_GROQ_REQUEST = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+
+
+def _groq_response(status_code: int) -> httpx.Response:
+    return httpx.Response(status_code, request=_GROQ_REQUEST)
+
+
 class TestLLMParsingServiceInitialization:
     """Test LLMParsingService initialization behavior"""
 
@@ -39,6 +50,49 @@ class TestLLMParsingServiceInitialization:
             with pytest.raises(ServiceUnavailableError):
                 LLMParsingService()
 
+    def test_instances_share_client(self):
+        """Test services reuse one Groq client and its connection pool"""
+        with patch.object(settings, 'GROQ_API_KEY', 'shared-key'):
+            first = LLMParsingService()
+            second = LLMParsingService()
+
+        assert first.client is second.client
+        assert first.client.max_retries == settings.LLM_MAX_RETRIES
+
+    @pytest.mark.asyncio
+    async def test_close_releases_client(self):
+        """Test close shuts the HTTP client down and is safe to repeat"""
+        with patch.object(settings, 'GROQ_API_KEY', 'test-key'):
+            service = LLMParsingService()
+
+        client = service.client
+        await service.close()
+        assert client.is_closed()
+        await service.close()
+
+        with patch.object(settings, 'GROQ_API_KEY', 'test-key'):
+            assert not LLMParsingService().client.is_closed()
+
+    @pytest.mark.asyncio
+    async def test_other_instances_recover_after_close(self):
+        """Test closing one instance does not leave the others with a closed client"""
+        with patch.object(settings, 'GROQ_API_KEY', 'test-key'):
+            closing = LLMParsingService()
+            other = LLMParsingService()
+
+        await closing.close()
+
+        assert not other.client.is_closed()
+        with patch.object(other.client.chat.completions, 'create', new_callable=AsyncMock) as mock_create:
+            mock_response = Mock()
+            mock_response.choices = [Mock()]
+            mock_response.choices[0].message.content = json.dumps({"resistance_exercises": []})
+            mock_create.return_value = mock_response
+
+            await other.parse_workout("Corri 5km depois do fechamento")
+
+        mock_create.assert_called_once()
+
 
 class TestLLMParsingServiceInputValidation:
     """Test input validation logic"""
@@ -131,6 +185,143 @@ class TestLLMParsingServiceWorkoutParsing:
             assert call_kwargs['model'] == settings.LLM_MODEL
             assert call_kwargs['temperature'] == settings.LLM_TEMPERATURE
             assert call_kwargs['max_completion_tokens'] == settings.LLM_MAX_TOKENS
+            assert call_kwargs['response_format'] == {"type": "json_object"}
+
+    @pytest.mark.asyncio
+    async def test_json_mode_request_mentions_json(self, service):
+        """Test JSON mode requests say "JSON" in the messages, which Groq requires"""
+        with patch.object(service.client.chat.completions, 'create', new_callable=AsyncMock) as mock_create:
+            mock_response = Mock()
+            mock_response.choices = [Mock()]
+            mock_response.choices[0].message.content = json.dumps({"resistance_exercises": []})
+            mock_create.return_value = mock_response
+
+            await service.parse_workout("Corri 5km")
+
+        call_kwargs = mock_create.call_args[1]
+        if call_kwargs.get('response_format', {}).get('type') == "json_object":
+            assert any("json" in message["content"].lower() for message in call_kwargs['messages'])
+
+    @pytest.mark.asyncio
+    async def test_repeated_transcription_uses_cache(self, service):
+        """Test the same transcription is parsed by the LLM only once"""
+        workout = {"resistance_exercises": [{"name": "supino reto", "sets": 1, "reps": [10], "weights_kg": [60]}]}
+
+        with patch.object(service.client.chat.completions, 'create', new_callable=AsyncMock) as mock_create:
+            mock_response = Mock()
+            mock_response.choices = [Mock()]
+            mock_response.choices[0].message.content = json.dumps(workout)
+            mock_create.return_value = mock_response
+
+            first = await service.parse_workout("Supino 1x10 com 60kg")
+            first["resistance_exercises"].clear()
+            second = await service.parse_workout("Supino 1x10 com 60kg")
+            await service.parse_workout("Agachamento 1x10 com 80kg")
+
+        assert second == workout
+        assert mock_create.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_capped(self, service):
+        """Test no more than LLM_MAX_CONCURRENCY calls reach Groq at once"""
+        service._semaphore = asyncio.Semaphore(2)
+        in_flight = peak = 0
+
+        async def slow_create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            mock_response = Mock()
+            mock_response.choices = [Mock()]
+            mock_response.choices[0].message.content = json.dumps({"resistance_exercises": []})
+            return mock_response
+
+        with patch.object(service.client.chat.completions, 'create', side_effect=slow_create):
+            await asyncio.gather(*(service.parse_workout(f"Supino {i}x10") for i in range(6)))
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_transcriptions_share_request(self, service):
+        """Test simultaneous duplicates wait for one Groq call and get independent copies"""
+        service._parse_cache.clear()
+
+        async def slow_create(**kwargs):
+            await asyncio.sleep(0.01)
+            mock_response = Mock()
+            mock_response.choices = [Mock()]
+            mock_response.choices[0].message.content = json.dumps({"resistance_exercises": []})
+            return mock_response
+
+        with patch.object(service.client.chat.completions, 'create', side_effect=slow_create) as mock_create:
+            first, second = await asyncio.gather(
+                service.parse_workout("Supino 3x10"),
+                service.parse_workout("supino  3x10"),
+            )
+
+        assert mock_create.call_count == 1
+        assert first == second
+        assert first is not second
+        assert service._inflight == {}
+
+    def test_failed_request_after_all_waiters_cancelled(self, service):
+        """Test a shared request that fails with no one waiting does not log an unretrieved exception"""
+        unhandled = []
+
+        async def scenario():
+            asyncio.get_running_loop().set_exception_handler(lambda _, context: unhandled.append(context))
+            started = asyncio.Event()
+            fail = asyncio.Event()
+
+            async def failing_create(**kwargs):
+                started.set()
+                await fail.wait()
+                raise APITimeoutError(request=_GROQ_REQUEST)
+
+            with patch.object(service.client.chat.completions, 'create', side_effect=failing_create):
+                waiters = [asyncio.ensure_future(service.parse_workout("Supino 3x10")) for _ in range(2)]
+                await started.wait()
+                for waiter in waiters:
+                    waiter.cancel()
+                await asyncio.gather(*waiters, return_exceptions=True)
+
+                fail.set()
+                while service._inflight:
+                    await asyncio.sleep(0)
+
+        # Own loop so every frame holding the request is gone before the check
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(scenario())
+        finally:
+            loop.close()
+        gc.collect()
+
+        assert unhandled == []
+
+    @pytest.mark.asyncio
+    async def test_sends_stripped_transcription(self, service):
+        """Test surrounding whitespace is trimmed before the prompt is built"""
+        with patch.object(service.client.chat.completions, 'create', new_callable=AsyncMock) as mock_create:
+            mock_response = Mock()
+            mock_response.choices = [Mock()]
+            mock_response.choices[0].message.content = json.dumps({"resistance_exercises": []})
+            mock_create.return_value = mock_response
+
+            await service.parse_workout("  \n Supino 3x10 \n ")
+
+        prompt = mock_create.call_args[1]['messages'][0]['content']
+        assert prompt.endswith('"Supino 3x10"')
+
+    def test_cache_key_normalizes_transcription_and_includes_model(self, service):
+        """Test case/whitespace variants share a key that changes with the model"""
+        key = service._cache_key("Supino 1x10 com 60kg")
+
+        assert service._cache_key("  supino   1x10\ncom 60KG ") == key
+        service.model = "other-model"
+        assert service._cache_key("Supino 1x10 com 60kg") != key
 
     @pytest.mark.asyncio
     async def test_handles_json_response_with_markdown_blocks(self, service):
@@ -148,6 +339,19 @@ class TestLLMParsingServiceWorkoutParsing:
             result = await service.parse_workout(transcription)
             assert result == workout_data
 
+    @pytest.mark.asyncio
+    async def test_keeps_backticks_inside_json_values(self, service):
+        """Test only the surrounding fence is stripped, not backticks in the payload"""
+        workout_data = {"notes": "usar ``` como separador"}
+
+        with patch.object(service.client.chat.completions, 'create', new_callable=AsyncMock) as mock_create:
+            mock_response = Mock()
+            mock_response.choices = [Mock()]
+            mock_response.choices[0].message.content = f"```\n{json.dumps(workout_data)}\n```"
+            mock_create.return_value = mock_response
+
+            assert await service.parse_workout("Treino com notas") == workout_data
+
     @pytest.mark.asyncio
     async def test_raises_error_for_invalid_json_response(self, service):
         """Test error handling when LLM returns invalid JSON"""
@@ -207,10 +411,23 @@ class TestLLMParsingServiceErrorHandling:
             assert exc_info.value.error_code == ErrorCode.LLM_INVALID_RESPONSE
             assert "Resposta vazia do LLM" in str(exc_info.value)
 
+    @pytest.mark.asyncio
+    async def test_handles_choice_without_message(self, service):
+        """Test handling when the first choice carries no message"""
+        with patch.object(service.client.chat.completions, 'create', new_callable=AsyncMock) as mock_create:
+            mock_response = Mock()
+            mock_response.choices = [Mock(message=None)]
+            mock_create.return_value = mock_response
+
+            with pytest.raises(LLMParsingError) as exc_info:
+                await service.parse_workout("test workout")
+
+            assert "Resposta vazia do LLM" in str(exc_info.value)
+
     @pytest.mark.asyncio
     async def test_handles_rate_limit_error(self, service):
         """Test handling of rate limit errors from API"""
-        rate_limit_error = Exception("rate_limit exceeded")
+        rate_limit_error = RateLimitError("rate_limit exceeded", response=_groq_response(429), body=None)
         
         with patch.object(service.client.chat.completions, 'create', new_callable=AsyncMock) as mock_create:
             mock_create.side_effect = rate_limit_error
@@ -224,7 +441,7 @@ class TestLLMParsingServiceErrorHandling:
     @pytest.mark.asyncio
     async def test_handles_authentication_error(self, service):
         """Test handling of authentication errors from API"""
-        auth_error = Exception("unauthorized access")
+        auth_error = AuthenticationError("unauthorized access", response=_groq_response(401), body=None)
         
         with patch.object(service.client.chat.completions, 'create', new_callable=AsyncMock) as mock_create:
             mock_create.side_effect = auth_error
@@ -238,7 +455,7 @@ class TestLLMParsingServiceErrorHandling:
     @pytest.mark.asyncio
     async def test_handles_timeout_error(self, service):
         """Test handling of timeout errors from API"""
-        timeout_error = Exception("connection timed out")
+        timeout_error = APITimeoutError(request=_GROQ_REQUEST)
         
         with patch.object(service.client.chat.completions, 'create', new_callable=AsyncMock) as mock_create:
             mock_create.side_effect = timeout_error
@@ -249,6 +466,30 @@ class TestLLMParsingServiceErrorHandling:
             assert exc_info.value.error_code == ErrorCode.LLM_TIMEOUT
             assert "Timeout na conexão" in str(exc_info.value)
 
+    @pytest.mark.asyncio
+    async def test_handles_gateway_timeout_status(self, service):
+        """Test an HTTP 504 from the API is reported as a timeout"""
+        gateway_error = APIStatusError("gateway timeout", response=_groq_response(504), body=None)
+
+        with patch.object(service.client.chat.completions, 'create', new_callable=AsyncMock) as mock_create:
+            mock_create.side_effect = gateway_error
+
+            with pytest.raises(ServiceUnavailableError) as exc_info:
+                await service.parse_workout("test workout")
+
+            assert exc_info.value.error_code == ErrorCode.LLM_TIMEOUT
+
+    @pytest.mark.asyncio
+    async def test_error_message_wording_does_not_drive_classification(self, service):
+        """Test plain exceptions mentioning rate limits are not misclassified"""
+        with patch.object(service.client.chat.completions, 'create', new_callable=AsyncMock) as mock_create:
+            mock_create.side_effect = Exception("rate_limit exceeded")
+
+            with pytest.raises(LLMParsingError) as exc_info:
+                await service.parse_workout("test workout")
+
+            assert exc_info.value.error_code == ErrorCode.LLM_PARSING_FAILED
+
     @pytest.mark.asyncio
     async def test_handles_generic_unexpected_error(self, service):
         """Test handling of unexpected generic errors"""
@@ -280,6 +521,24 @@ class TestLLMParsingServicePromptBuilding:
         assert user_input in prompt
         assert "Você é um assistente especializado em fitness brasileiro" in prompt
 
+    def test_prompt_keeps_transcription_verbatim(self, service):
+        """Test braces and quotes in the transcription are not treated as template syntax"""
+        user_input = 'anotei {peso} como "60kg"'
+        prompt = service._build_prompt(user_input)
+
+        assert f'"{user_input}"' in prompt
+        assert '{"sets": 3, "reps": [12, 10, 8], "weights_kg": [10, 15, 20]}' in prompt
+
+    def test_prompt_puts_transcription_last(self, service):
+        """Test the instructions form a shared prefix and the transcription comes last"""
+        first = service._build_prompt("Supino 3x10")
+        second = service._build_prompt("Corri 5km")
+
+        assert first.endswith('"Supino 3x10"')
+        prefix = first[:-len('"Supino 3x10"')]
+        assert second.startswith(prefix)
+        assert "resistance_exercises" in prefix
+
     def test_prompt_contains_exercise_naming_guidelines(self, service):
         """Test that prompt includes comprehensive exercise naming guidelines"""
         prompt = service._build_prompt("treino teste")
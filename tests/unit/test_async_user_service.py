@@ -4,7 +4,11 @@ These tests focus on business logic validation, edge cases, and validation rules
 They test the core business functionality without database dependencies.
 """
 
+from unittest.mock import patch
+
 import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
 from services.async_user_service import AsyncUserService
 from services.exceptions import ValidationError, ErrorCode
 
@@ -369,6 +373,17 @@ class TestAuthorizationLogic:
                 # Any exception should be handled gracefully
                 pass
 
+    @pytest.mark.asyncio
+    async def test_database_error_denies_without_caching(self, user_service):
+        """A failed lookup denies access and is retried on the next check"""
+        with patch("services.async_user_service.get_async_session_context",
+                   side_effect=SQLAlchemyError("connection lost")):
+            assert await user_service.get_auth_state("123") == (False, False)
+            assert await user_service.is_user_authorized("123") is False
+            assert await user_service.is_user_admin("123") is False
+
+        assert "123" not in user_service._auth_cache
+
 
 class TestUserListingAndCounting:
     """Test user listing and counting edge cases"""
@@ -95,29 +95,25 @@ class TestUpdateSessionDataAsync:
         return AsyncWorkoutService()
     
     @pytest.mark.asyncio
-    async def test_update_session_audio_count_increment(self, workout_service):
+    async def test_update_session_audio_count_increment(self, workout_service, apply_session_update):
         """Test audio count is always incremented"""
         
         mock_session = MagicMock()
         mock_workout_session = MagicMock()
-        mock_workout_session.audio_count = 5
-        mock_workout_session.notes = None
         
         await workout_service._update_session_data_async(
             mock_session, mock_workout_session, {}
         )
         
-        assert mock_workout_session.audio_count == 6
+        assert apply_session_update(mock_workout_session, audio_count=5).audio_count == 6
         mock_session.add.assert_called_once_with(mock_workout_session)
 
     @pytest.mark.asyncio
-    async def test_update_session_optional_fields(self, workout_service):
+    async def test_update_session_optional_fields(self, workout_service, apply_session_update):
         """Test optional field updates"""
         
         mock_session = MagicMock()
         mock_workout_session = MagicMock()
-        mock_workout_session.audio_count = 1
-        mock_workout_session.notes = "Existing notes"
         
         parsed_data = {
             "energy_level": 8,
@@ -129,33 +125,31 @@ class TestUpdateSessionDataAsync:
             mock_session, mock_workout_session, parsed_data
         )
         
-        assert mock_workout_session.audio_count == 2
+        row = apply_session_update(mock_workout_session, audio_count=1, notes="Existing notes")
+        assert row.audio_count == 2
         assert mock_workout_session.energy_level == 8
         assert mock_workout_session.difficulty == 7
-        assert mock_workout_session.notes == "Existing notes\nNew notes"
+        assert row.notes == "Existing notes\nNew notes"
 
     @pytest.mark.asyncio
-    async def test_update_session_notes_concatenation(self, workout_service):
+    async def test_update_session_notes_concatenation(self, workout_service, apply_session_update):
         """Test notes are properly concatenated"""
         
         mock_session = MagicMock()
         mock_workout_session = MagicMock()
-        mock_workout_session.audio_count = 0
         
         # Test with None existing notes
-        mock_workout_session.notes = None
         await workout_service._update_session_data_async(
             mock_session, mock_workout_session, {"notes": "First note"}
         )
-        assert mock_workout_session.notes == "First note"
+        assert apply_session_update(mock_workout_session, notes=None).notes == "First note"
         
         # Test with empty existing notes
-        mock_workout_session.notes = ""
         await workout_service._update_session_data_async(
             mock_session, mock_workout_session, {"notes": "Second note"}
         )
-        # Empty string + "\n" + "Second note" gets stripped to just "Second note"
-        assert mock_workout_session.notes == "Second note"
+        # Empty existing notes get no leading newline
+        assert apply_session_update(mock_workout_session, notes="").notes == "Second note"
 
 
 class TestCalculateSessionStatsAsync:
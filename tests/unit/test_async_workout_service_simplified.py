@@ -82,52 +82,47 @@ class TestSessionDataUpdate:
         return AsyncWorkoutService()
     
     @pytest.mark.asyncio
-    async def test_audio_count_increment(self, workout_service):
+    async def test_audio_count_increment(self, workout_service, apply_session_update):
         """Test that audio count is always incremented by 1"""
         mock_session = MagicMock()
         mock_workout_session = MagicMock()
         
         # Test with different initial values
         for initial_count in [0, 1, 5, 99, 1000]:
-            mock_workout_session.audio_count = initial_count
-            mock_workout_session.notes = None
-            
             await workout_service._update_session_data_async(
                 mock_session, mock_workout_session, {}
             )
             
-            assert mock_workout_session.audio_count == initial_count + 1
+            row = apply_session_update(mock_workout_session, audio_count=initial_count)
+            assert row.audio_count == initial_count + 1
 
     @pytest.mark.asyncio
-    async def test_notes_concatenation_logic(self, workout_service):
+    async def test_notes_concatenation_logic(self, workout_service, apply_session_update):
         """Test notes concatenation with various scenarios"""
         mock_session = MagicMock()
         mock_workout_session = MagicMock()
-        mock_workout_session.audio_count = 0
         
         test_cases = [
             # (existing_notes, new_notes, expected_result)
             (None, "New note", "New note"),
             ("", "New note", "New note"),
+            (None, "  Padded  ", "Padded"),
             ("Old note", "New note", "Old note\nNew note"),
             ("Multiple\nLines", "Another", "Multiple\nLines\nAnother"),
-            ("   Spaced   ", "  Test  ", "Spaced   \n  Test"),  # .strip() removes outer whitespace
+            ("Spaced   ", "  Test  ", "Spaced   \n  Test"),  # Trailing whitespace of the new note is dropped
         ]
         
         for existing, new, expected in test_cases:
-            mock_workout_session.notes = existing
             await workout_service._update_session_data_async(
                 mock_session, mock_workout_session, {"notes": new}
             )
-            assert mock_workout_session.notes == expected
+            assert apply_session_update(mock_workout_session, notes=existing).notes == expected
 
     @pytest.mark.asyncio
-    async def test_optional_fields_update(self, workout_service):
+    async def test_optional_fields_update(self, workout_service, apply_session_update):
         """Test optional fields are only updated when present"""
         mock_session = MagicMock()
         mock_workout_session = MagicMock()
-        mock_workout_session.audio_count = 1
-        mock_workout_session.notes = None
         
         # Test with all optional fields
         parsed_data = {
@@ -142,10 +137,10 @@ class TestSessionDataUpdate:
         
         assert mock_workout_session.energy_level == 8
         assert mock_workout_session.difficulty == 7
-        assert mock_workout_session.notes == "Great workout"
+        assert apply_session_update(mock_workout_session, notes=None).notes == "Great workout"
         
         # Test with empty parsed data
-        mock_workout_session.audio_count = 0
+        mock_workout_session = MagicMock()
         original_energy = getattr(mock_workout_session, 'energy_level', None)
         
         await workout_service._update_session_data_async(
@@ -153,7 +148,7 @@ class TestSessionDataUpdate:
         )
         
         # Should only increment audio_count, leave other fields unchanged
-        assert mock_workout_session.audio_count == 1
+        assert apply_session_update(mock_workout_session, audio_count=0).audio_count == 1
 
 
 class TestSessionStatsCalculation:
@@ -1,8 +1,10 @@
 """Unit tests for backup service"""
 
+import asyncio
 import os
 import time
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -210,6 +212,32 @@ class TestBackupService:
         test_backup_service.stop_automated_backups()  # Should not error
         assert not test_backup_service.is_running
 
+    @pytest.mark.asyncio
+    async def test_scheduler_exits_as_soon_as_stop_is_requested(self, test_backup_service):
+        """Test the scheduler wakes on the stop event instead of polling"""
+        test_backup_service.is_running = True
+        task = asyncio.create_task(test_backup_service._run_async_scheduler())
+        await asyncio.sleep(0)
+
+        test_backup_service.is_running = False
+        test_backup_service._stop_event.set()
+
+        await asyncio.wait_for(task, timeout=0.5)
+
+    @pytest.mark.asyncio
+    async def test_scheduler_runs_backup_when_due(self, test_backup_service):
+        """Test a due backup runs and the scheduler keeps waiting afterwards"""
+        test_backup_service.backup_frequency_hours = 0
+        test_backup_service.is_running = True
+
+        async def scheduled_backup():
+            test_backup_service._stop_event.set()
+
+        with patch.object(test_backup_service, "_scheduled_backup", side_effect=scheduled_backup) as backup:
+            await asyncio.wait_for(test_backup_service._run_async_scheduler(), timeout=1)
+
+        backup.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_restore_backup_validation(self, test_backup_service):
         """Test backup restore validation"""
@@ -4,7 +4,7 @@ from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
-from services.async_health_service import BotMetrics, SystemMetrics
+from services.async_health_service import BotMetrics, DatabaseMetrics, SystemMetrics
 
 
 class TestHealthService:
@@ -17,6 +17,8 @@ class TestHealthService:
         assert test_health_service.error_count == 0
         assert len(test_health_service.response_times) == 0
         assert test_health_service.max_response_times == 1000
+        # asyncio locks are created on first use, not at import time
+        assert test_health_service._cache_locks == {}
 
     def test_record_command_metrics(self, test_health_service):
         """Test recording command metrics"""
@@ -58,6 +60,15 @@ class TestHealthService:
         assert test_health_service.response_times[0] == 300  # 100 + 200 (1200 - 1000)
         assert test_health_service.response_times[-1] == 1299  # 100 + 1199
 
+    def test_response_time_average_after_wraparound(self, test_health_service):
+        """Test running sum drops evicted samples once the ring wraps"""
+        for i in range(1200):
+            test_health_service.record_command(100 + i, False)
+
+        expected = sum(range(300, 1300)) / 1000
+        assert test_health_service.get_average_response_time() == pytest.approx(expected)
+        assert test_health_service.get_percentile_response_time(0.0) == 300
+
     @pytest.mark.asyncio
     async def test_get_health_status(self, test_health_service):
         """Test comprehensive health status"""
@@ -83,6 +94,25 @@ class TestHealthService:
             mock_checks.assert_called_once()
             mock_metrics.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_get_health_status_is_cached(self, test_health_service):
+        """Test repeated probes within the TTL reuse the last report"""
+        with patch.object(test_health_service, "_run_health_checks", new_callable=AsyncMock) as mock_checks, \
+             patch.object(test_health_service, "_collect_metrics", new_callable=AsyncMock) as mock_metrics:
+            mock_checks.return_value = {"database": {"status": "healthy"}}
+            mock_metrics.return_value = {}
+
+            first = await test_health_service.get_health_status()
+            second = await test_health_service.get_health_status()
+            assert second is first
+            mock_checks.assert_called_once()
+
+            # An expired entry triggers a fresh run
+            test_health_service._cache["full"] = (0.0, first)
+            third = await test_health_service.get_health_status()
+            assert third is not first
+            assert mock_checks.call_count == 2
+
     @pytest.mark.asyncio
     async def test_health_status_error_handling(self, test_health_service):
         """Test health status error handling"""
@@ -100,7 +130,7 @@ class TestHealthService:
         """Test simple health check"""
         with patch("psutil.cpu_percent") as mock_cpu, \
              patch("psutil.virtual_memory") as mock_memory, \
-             patch("database.async_connection.get_async_session_context") as mock_session:
+             patch("services.async_health_service.get_health_session_context") as mock_session:
 
             mock_cpu.return_value = 15.0
             mock_memory.return_value = Mock(percent=60.0)
@@ -124,7 +154,7 @@ class TestHealthService:
         """Test simple health check with degraded status"""
         with patch("psutil.cpu_percent") as mock_cpu, \
              patch("psutil.virtual_memory") as mock_memory, \
-             patch("database.async_connection.get_async_session_context") as mock_session:
+             patch("services.async_health_service.get_health_session_context") as mock_session:
 
             mock_cpu.return_value = 85.0  # High CPU
             mock_memory.return_value = Mock(percent=85.0)  # High memory
@@ -192,6 +222,22 @@ class TestHealthService:
             assert metrics.error_rate_percent == 40.0  # 2 errors out of 5 total
             assert metrics.active_sessions == 1
 
+    @pytest.mark.asyncio
+    async def test_get_bot_metrics_snapshot_before_db_query(self, test_health_service):
+        """Test records landing during the DB query don't skew the metrics"""
+        test_health_service.record_command(100, True)
+
+        async def record_during_query():
+            test_health_service.record_command(200, False)
+            return 0
+
+        with patch.object(test_health_service, '_get_active_sessions_count', side_effect=record_during_query):
+            metrics = await test_health_service._get_bot_metrics_async()
+
+        assert metrics.total_commands_processed == 1
+        assert metrics.error_rate_percent == 100.0
+        assert metrics.average_response_time_ms == 100.0
+
     @pytest.mark.asyncio
     async def test_get_bot_metrics_no_data(self, test_health_service):
         """Test bot metrics with no recorded data"""
@@ -206,6 +252,21 @@ class TestHealthService:
             assert metrics.error_rate_percent == 0
             assert metrics.active_sessions == 1
 
+    @pytest.mark.asyncio
+    async def test_collect_metrics_matches_model_dump(self, test_health_service):
+        """Test the collected metrics dicts equal the models' model_dump()"""
+        test_health_service.record_command(100, False)
+        bot = await test_health_service._get_bot_metrics_async()
+        system = test_health_service._get_system_metrics()
+
+        with patch.object(test_health_service, "_get_bot_metrics_async", new_callable=AsyncMock, return_value=bot), \
+             patch.object(test_health_service, "_get_system_metrics", return_value=system):
+            metrics = await test_health_service._collect_metrics()
+
+        assert metrics["bot"] == bot.model_dump()
+        assert metrics["system"] == system.model_dump()
+        assert set(metrics["database"]) == set(DatabaseMetrics.model_fields)
+
     def test_determine_overall_status(self, test_health_service):
         """Test overall status determination"""
         # All healthy
@@ -281,6 +342,77 @@ class TestHealthServiceSystemChecks:
             assert "High memory usage: 85.0%" in result["warnings"]
             assert "High disk usage: 95.0%" in result["warnings"]
 
+    @pytest.mark.asyncio
+    async def test_run_health_checks_isolates_failures(self, test_health_service):
+        """Test one raising check doesn't hide the results of the others"""
+        healthy = {"status": "healthy"}
+        with patch.object(test_health_service, "_check_database", new_callable=AsyncMock, return_value=healthy), \
+             patch.object(test_health_service, "_check_system_resources", side_effect=RuntimeError("boom")), \
+             patch.object(test_health_service, "_check_configuration", return_value=healthy), \
+             patch.object(test_health_service, "_check_dependencies", return_value=healthy):
+
+            checks = await test_health_service._run_health_checks()
+
+        assert checks["database"] == healthy
+        assert checks["async_database"] is checks["database"]
+        assert checks["configuration"] == healthy
+        assert checks["system_resources"]["status"] == "unhealthy"
+        assert "boom" in checks["system_resources"]["message"]
+
+    @pytest.mark.asyncio
+    async def test_check_database_retries_transient_failures(self, test_health_service):
+        """Test a timed-out probe is retried before reporting unhealthy"""
+        with patch("services.async_health_service._DB_PROBE_BACKOFF_SECONDS", 0), \
+             patch.object(test_health_service, "_probe_database", new_callable=AsyncMock) as mock_probe:
+            mock_probe.side_effect = [TimeoutError(), 1]
+
+            result = await test_health_service._check_database()
+
+        assert result["status"] == "healthy"
+        assert result["attempts"] == 2
+        assert [c.args[0] for c in mock_probe.call_args_list] == [1.0, 2.0]
+
+    @pytest.mark.asyncio
+    async def test_check_database_gives_up_after_last_attempt(self, test_health_service):
+        """Test the database is unhealthy once every attempt fails"""
+        with patch("services.async_health_service._DB_PROBE_BACKOFF_SECONDS", 0), \
+             patch.object(test_health_service, "_probe_database", new_callable=AsyncMock) as mock_probe:
+            mock_probe.side_effect = TimeoutError()
+
+            result = await test_health_service._check_database()
+
+        assert result["status"] == "unhealthy"
+        assert "TimeoutError" in result["message"]
+        assert mock_probe.call_count == 3
+
+    def test_psutil_sample_is_throttled(self, test_health_service):
+        """Test back-to-back checks reuse one non-blocking psutil sample"""
+        with patch("psutil.cpu_percent", return_value=20.0) as mock_cpu, \
+             patch("psutil.virtual_memory", return_value=Mock(percent=50.0)), \
+             patch("psutil.disk_usage", return_value=Mock(percent=40.0)):
+
+            first = test_health_service._check_system_resources()
+            second = test_health_service._check_system_resources()
+
+        assert first["cpu_percent"] == second["cpu_percent"] == 20.0
+        mock_cpu.assert_called_once_with(interval=None)
+
+    def test_disk_usage_outlives_cpu_sample(self, test_health_service):
+        """Test disk usage is cached longer than the CPU reading"""
+        with patch("psutil.cpu_percent", return_value=20.0) as mock_cpu, \
+             patch("psutil.virtual_memory", return_value=Mock(percent=50.0)), \
+             patch("psutil.disk_usage", return_value=Mock(percent=40.0)) as mock_disk:
+
+            test_health_service._sample_psutil()
+            # Age every reading past the CPU TTL but well within the disk TTL
+            samples = test_health_service._psutil_samples
+            for name, (taken_at, value) in samples.items():
+                samples[name] = (taken_at - 2.0, value)
+            test_health_service._sample_psutil()
+
+        assert mock_cpu.call_count == 2
+        mock_disk.assert_called_once_with("/")
+
     def test_check_dependencies(self, test_health_service):
         """Test dependencies check"""
         result = test_health_service._check_dependencies()
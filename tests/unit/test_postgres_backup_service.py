@@ -0,0 +1,237 @@
+"""Unit tests for postgres_backup_service.py
+
+pg_dump is replaced by a small Python script so the subprocess handling runs
+for real without a PostgreSQL server.
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from services.exceptions import BackupError
+from services.postgres_backup_service import PostgreSQLBackupService
+
+_real_exec = asyncio.create_subprocess_exec
+
+
+def _fake_client(script, calls=None, **tool_scripts):
+    """Run `script` with the Python interpreter in place of pg_dump/psql
+    
+    `tool_scripts` overrides the script per program name and `calls`, when
+    given, collects the original command lines.
+    """
+    async def create_subprocess_exec(program, *args, **kwargs):
+        if calls is not None:
+            calls.append([program, *args])
+        return await _real_exec(sys.executable, "-c", tool_scripts.get(program, script), **kwargs)
+    return patch("services.postgres_backup_service.asyncio.create_subprocess_exec", create_subprocess_exec)
+
+
+@pytest.fixture
+def backup_service(temp_dir):
+    with patch("services.postgres_backup_service.shutil.which", return_value="/usr/bin/pg_dump"):
+        yield PostgreSQLBackupService(backup_dir=temp_dir)
+
+
+class TestCreateBackupSql:
+    """Test pg_dump output handling"""
+
+    @pytest.mark.asyncio
+    async def test_streams_dump_to_file(self, backup_service):
+        script = (
+            "import sys\n"
+            "for i in range(2000):\n"
+            "    sys.stdout.write(f'INSERT INTO t VALUES ({i});\\n')\n"
+            "    sys.stderr.write('pg_dump: progress\\n' * 10)\n"
+        )
+        with _fake_client(script):
+            path = await backup_service.create_backup_sql("dump.sql")
+
+        with open(path) as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 2000
+        assert lines[-1] == "INSERT INTO t VALUES (1999);"
+
+    @pytest.mark.asyncio
+    async def test_failed_dump_removes_partial_file(self, backup_service, temp_dir):
+        script = "import sys; print('partial'); sys.stderr.write('connection refused'); sys.exit(1)"
+        with _fake_client(script):
+            with pytest.raises(BackupError, match="connection refused"):
+                await backup_service.create_backup_sql("dump.sql")
+
+        assert not os.path.exists(os.path.join(temp_dir, "dump.sql"))
+
+    @pytest.mark.asyncio
+    async def test_compressed_default_name(self, backup_service):
+        backup_service.sql_compression = True
+        calls = []
+        with _fake_client("print('compressed')", calls):
+            path = await backup_service.create_backup_sql()
+
+        assert path.endswith(".sql.zst")
+        assert calls[0][0] == "pg_dump"
+        assert "--compress=zstd:3" in calls[0]
+        assert "--verbose" not in calls[0]
+
+    @pytest.mark.asyncio
+    async def test_plain_sql_name_is_not_compressed(self, backup_service):
+        calls = []
+        with _fake_client("print('plain')", calls):
+            await backup_service.create_backup_sql("dump.sql")
+
+        assert not any(arg.startswith("--compress") for arg in calls[0])
+
+    @pytest.mark.asyncio
+    async def test_default_name_is_not_compressed(self, backup_service):
+        calls = []
+        with _fake_client("print('plain')", calls):
+            path = await backup_service.create_backup_sql()
+
+        assert path.endswith(".sql")
+        assert not any(arg.startswith("--compress") for arg in calls[0])
+
+
+class TestClientToolLookup:
+    """Test pg_dump/psql availability checks"""
+
+    def test_successful_lookup_is_cached(self, temp_dir):
+        service = PostgreSQLBackupService(backup_dir=temp_dir)
+        with patch("services.postgres_backup_service.shutil.which", return_value="/usr/bin/psql") as which:
+            service._require_client_tool("psql")
+            service._require_client_tool("psql")
+
+        which.assert_called_once_with("psql")
+
+    def test_missing_tool_raises_and_is_rechecked(self, temp_dir):
+        service = PostgreSQLBackupService(backup_dir=temp_dir)
+        with patch("services.postgres_backup_service.shutil.which", return_value=None) as which:
+            with pytest.raises(BackupError, match="pg_dump not found"):
+                service._require_client_tool("pg_dump")
+            with pytest.raises(BackupError):
+                service._require_client_tool("pg_dump")
+
+        assert which.call_count == 2
+
+
+class TestRestoreFromSql:
+    """Test feeding a dump to psql"""
+
+    @pytest.mark.asyncio
+    async def test_streams_file_to_psql_stdin(self, backup_service, temp_dir):
+        dump_path = os.path.join(temp_dir, "dump.sql")
+        received_path = os.path.join(temp_dir, "received.sql")
+        dump = b"".join(f"INSERT INTO t VALUES ({i}, 'ação');\n".encode() for i in range(20000))
+        with open(dump_path, "wb") as f:
+            f.write(dump)
+
+        script = f"import shutil, sys; shutil.copyfileobj(sys.stdin.buffer, open({received_path!r}, 'wb'))"
+        with _fake_client(script):
+            assert await backup_service.restore_from_sql(dump_path, confirm=True) is True
+
+        with open(received_path, "rb") as f:
+            assert f.read() == dump
+
+    @pytest.mark.asyncio
+    async def test_reports_psql_failure(self, backup_service, temp_dir):
+        dump_path = os.path.join(temp_dir, "dump.sql")
+        with open(dump_path, "wb") as f:
+            f.write(b"SELECT 1;\n" * 100000)
+
+        script = "import sys; sys.stderr.write('syntax error'); sys.exit(3)"
+        with _fake_client(script):
+            with pytest.raises(BackupError, match="syntax error"):
+                await backup_service.restore_from_sql(dump_path, confirm=True)
+
+    @pytest.mark.asyncio
+    async def test_pipes_zstd_output_to_psql(self, backup_service, temp_dir):
+        dump_path = os.path.join(temp_dir, "dump.sql.zst")
+        received_path = os.path.join(temp_dir, "received.sql")
+        dump = b"".join(f"INSERT INTO t VALUES ({i});\n".encode() for i in range(20000))
+        with open(dump_path, "wb") as f:
+            f.write(dump)
+
+        calls = []
+        zstd = f"import shutil, sys; shutil.copyfileobj(open({dump_path!r}, 'rb'), sys.stdout.buffer)"
+        psql = f"import shutil, sys; shutil.copyfileobj(sys.stdin.buffer, open({received_path!r}, 'wb'))"
+        with _fake_client(psql, calls, zstd=zstd):
+            assert await backup_service.restore_from_sql(dump_path, confirm=True) is True
+
+        assert [call[0] for call in calls] == ["zstd", "psql"]
+        assert calls[0][-1] == dump_path
+        with open(received_path, "rb") as f:
+            assert f.read() == dump
+
+    @pytest.mark.asyncio
+    async def test_reports_zstd_failure(self, backup_service, temp_dir):
+        dump_path = os.path.join(temp_dir, "dump.sql.zst")
+        with open(dump_path, "wb") as f:
+            f.write(b"not zstd")
+
+        zstd = "import sys; sys.stderr.write('unknown header'); sys.exit(1)"
+        psql = "import sys; sys.stdin.buffer.read()"
+        with _fake_client(psql, zstd=zstd):
+            with pytest.raises(BackupError, match="unknown header"):
+                await backup_service.restore_from_sql(dump_path, confirm=True)
+
+
+class TestListBackups:
+    """Test backup directory listing"""
+
+    @pytest.mark.asyncio
+    async def test_lists_sql_and_json_newest_first(self, backup_service, temp_dir):
+        for offset, name in enumerate(["old.sql", "mid.sql.zst", "new.json", "notes.txt", ".hidden.sql"]):
+            path = os.path.join(temp_dir, name)
+            with open(path, "wb") as f:
+                f.write(b"x" * 1024)
+            os.utime(path, (1_700_000_000 + offset, 1_700_000_000 + offset))
+        os.mkdir(os.path.join(temp_dir, "dir.sql"))
+
+        backups = await backup_service.list_backups()
+
+        assert {b["name"]: b["type"] for b in backups} == {"old.sql": "sql", "mid.sql.zst": "sql", "new.json": "json"}
+        assert [b["name"] for b in backups] == ["new.json", "mid.sql.zst", "old.sql"]
+        assert backups[0]["created"] == datetime.fromtimestamp(1_700_000_002)
+        assert backups[0]["path"] == os.path.join(temp_dir, backups[0]["name"])
+
+
+class TestCleanupOldBackups:
+    """Test removal of backups beyond max_backups"""
+
+    def _create_backups(self, temp_dir, names):
+        for offset, name in enumerate(names):
+            path = os.path.join(temp_dir, name)
+            with open(path, "wb") as f:
+                f.write(b"x")
+            os.utime(path, (1_700_000_000 + offset, 1_700_000_000 + offset))
+
+    @pytest.mark.asyncio
+    async def test_removes_oldest_in_one_thread_call(self, backup_service, temp_dir):
+        backup_service.max_backups = 2
+        self._create_backups(temp_dir, ["a.sql", "b.sql.zst", "c.json", "d.sql"])
+
+        with patch("services.postgres_backup_service.asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+            await backup_service.cleanup_old_backups()
+
+        assert sorted(os.listdir(temp_dir)) == ["c.json", "d.sql"]
+        removals = [c for c in to_thread.call_args_list if c.args[0] == backup_service._remove_files]
+        assert len(removals) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_removal_does_not_stop_cleanup(self, backup_service, temp_dir):
+        backup_service.max_backups = 1
+        self._create_backups(temp_dir, ["a.sql", "b.sql", "c.sql"])
+        real_remove = os.remove
+
+        def remove(path):
+            if path.endswith("b.sql"):
+                raise PermissionError("busy")
+            real_remove(path)
+
+        with patch("services.postgres_backup_service.os.remove", side_effect=remove):
+            await backup_service.cleanup_old_backups()
+
+        assert sorted(os.listdir(temp_dir)) == ["b.sql", "c.sql"]